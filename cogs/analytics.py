@@ -1,122 +1,247 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from datetime import datetime, timedelta
-from collections import Counter
+from datetime import datetime, timedelta, timezone
+import calendar
 import re
 import asyncio
+import os
+from utils.message_index import MessageIndex
+from utils.progress import ProgressReporter
 
 class MessageAnalytics(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.emoji_pattern = re.compile(r'<a?:.+?:\d+>|[\U0001F300-\U0001F9FF]|[\u2600-\u26FF\u2700-\u27BF]')
+        self.max_concurrent_channels = int(os.getenv('ANALYTICS_MAX_CONCURRENT_CHANNELS', 5))
+        self.backfill_days = int(os.getenv('ANALYTICS_BACKFILL_DAYS', 30))
+        self.MAX_DAYS = 365
+        self.index = MessageIndex(bot.store)
+        self.live_since = None          # Messages created after this are counted by on_message
+        self.caught_up = set()          # Channel ids whose backfill has reached live_since
+        self.backfills = {}             # {guild_id: asyncio.Task}
+        self.backfill_progress = {}     # {guild_id: {"messages", "channels", "total_channels", "reporters"}}
+        self.startup_task = None
+
+    async def cog_load(self):
+        await self.index.open()
+        self.startup_task = asyncio.create_task(self._start_backfills())
+
+    async def cog_unload(self):
+        if self.startup_task:
+            self.startup_task.cancel()
+        for task in self.backfills.values():
+            task.cancel()
+        await self.index.close()
+
+    async def _start_backfills(self):
+        await self.bot.wait_until_ready()
+        self.live_since = discord.utils.utcnow()
+        for guild in self.bot.guilds:
+            self.start_backfill(guild)
+
+    def start_backfill(self, guild: discord.Guild):
+        """Index any history between each channel's watermark and live_since"""
+        task = self.backfills.get(guild.id)
+        if task and not task.done():
+            return task
+        self.index.start_live(guild.id, self.live_since.timestamp())
+        task = asyncio.create_task(self.backfill_guild(guild))
+        self.backfills[guild.id] = task
+        return task
+
+    def record_message(self, message: discord.Message):
+        """Count a message and the emojis in its text.
+
+        Reactions are only counted live by on_raw_reaction_add, at the time they
+        are added: a backfilled message's current reactions may include ones
+        already counted live, and carry no timestamp of their own.
+        """
+        emojis = self.emoji_pattern.findall(message.content)
+        self.index.record_message(
+            message.guild.id, message.channel.id, message.author.id,
+            message.author.bot, message.created_at, emojis
+        )
+
+    async def backfill_guild(self, guild: discord.Guild):
+        text_channels = [
+            channel for channel in guild.text_channels
+            if channel.permissions_for(guild.me).read_message_history
+        ]
+        progress = {"messages": 0, "channels": 0, "total_channels": len(text_channels), "reporters": set()}
+        self.backfill_progress[guild.id] = progress
+
+        try:
+            watermarks = await self.index.get_watermarks(guild.id)
+            # Ranges an earlier run already counted live, in case it stopped before backfill caught up
+            counted = await self.index.get_live_windows(guild.id, self.live_since.timestamp())
+            default_start = self.live_since - timedelta(days=self.backfill_days)
+            await self.index.set_indexed_since(guild.id, default_start.timestamp())
+
+            # Scan channels concurrently; discord.py queues requests per rate-limit bucket
+            semaphore = asyncio.Semaphore(self.max_concurrent_channels)
+            await asyncio.gather(*[
+                self.backfill_channel(
+                    channel,
+                    discord.Object(id=watermarks[channel.id]) if channel.id in watermarks else default_start,
+                    semaphore,
+                    progress,
+                    counted
+                )
+                for channel in text_channels
+            ])
+            await self.index.flush()
+            if progress["channels"] == progress["total_channels"]:
+                await self.index.prune_live_windows(guild.id, self.live_since.timestamp())
+            print(f"Indexed {progress['messages']:,} backfilled messages for {guild.name}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Backfill failed for {guild.name}: {e}")
+
+    async def backfill_channel(self, channel, after, semaphore, progress, counted=()):
+        """Index one channel's history from ``after`` up to live_since, skipping ``counted`` ranges"""
+        live_cutoff = discord.Object(id=discord.utils.time_snowflake(self.live_since))
+        async with semaphore:
+            try:
+                async for message in channel.history(after=after, before=live_cutoff, limit=None, oldest_first=True):
+                    created = message.created_at.timestamp()
+                    if not any(since <= created < until for since, until in counted):
+                        self.record_message(message)
+                    self.index.advance_watermark(channel.guild.id, channel.id, message.id)
+                    progress["messages"] += 1
+                    self.report_backfill(progress)
+            except discord.Forbidden:
+                return
+            except Exception as e:
+                print(f"Error in channel {channel.name}: {e}")
+                return
+
+        # Everything before live_since is indexed; on_message covers the rest
+        self.index.advance_watermark(channel.guild.id, channel.id, live_cutoff.id)
+        self.caught_up.add(channel.id)
+        progress["channels"] += 1
+        self.report_backfill(progress)
+
+    def report_backfill(self, progress: dict):
+        """Push backfill progress to anyone waiting on it (edits are throttled by the reporter)"""
+        if not progress["reporters"]:
+            return
+        content = f"📊 Indexed {progress['messages']:,} messages from {progress['channels']}/{progress['total_channels']} channels..."
+        for reporter in progress["reporters"]:
+            reporter.update(content=content)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild is None or self.live_since is None or message.created_at < self.live_since:
+            return
+        self.record_message(message)
+        # Only move the watermark once backfill is done, or a restart would skip the gap
+        if message.channel.id in self.caught_up:
+            self.index.advance_watermark(message.guild.id, message.channel.id, message.id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        # Raw event so reactions on uncached messages are counted too
+        if payload.guild_id is None or self.live_since is None or not payload.emoji.is_unicode_emoji():
+            return
+        self.index.record_reaction(payload.guild_id, str(payload.emoji), discord.utils.utcnow())
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        if self.live_since is not None:
+            self.start_backfill(guild)
+
+    def channel_label(self, guild: discord.Guild, channel_id: int) -> str:
+        channel = guild.get_channel(channel_id)
+        return f"#{channel.name}" if channel else f"<#{channel_id}>"
+
+    def user_label(self, guild: discord.Guild, user_id: int) -> str:
+        member = guild.get_member(user_id)
+        return member.display_name if member else f"<@{user_id}>"
 
     @app_commands.command(name="analytics", description="Get message analytics for the server")
-    @app_commands.describe(days="Number of days to analyze (default: 7, max: 30)")
+    @app_commands.describe(days="Number of days to analyze (default: 7, max: 365)")
     async def analytics(self, interaction: discord.Interaction, days: int = 7):
         await interaction.response.defer()
 
-        if days > 30:
-            await interaction.followup.send("Maximum analysis period is 30 days!")
+        if days < 1 or days > self.MAX_DAYS:
+            await interaction.followup.send(f"Analysis period must be between 1 and {self.MAX_DAYS} days!")
             return
 
-        start_time = datetime.utcnow() - timedelta(days=days)
-        
-        # Initialize counters
-        channel_messages = Counter()
-        user_messages = Counter()
-        emoji_usage = Counter()
-        hour_activity = Counter()
-        day_activity = Counter()
-
-        # Get list of text channels with permissions
-        text_channels = [
-            channel for channel in interaction.guild.text_channels 
-            if channel.permissions_for(interaction.guild.me).read_message_history
-        ]
-        
-        # Status message
-        status = await interaction.followup.send(f"📊 Analyzing messages from {len(text_channels)} channels...")
-        total_messages = 0
-        channels_processed = 0
+        guild = interaction.guild
+        status = None
 
         try:
-            for channel in text_channels:
+            # Wait for an in-progress backfill so the numbers are complete
+            backfill = self.backfills.get(guild.id)
+            if backfill and not backfill.done():
+                status = ProgressReporter(message=await interaction.followup.send("📊 Indexing message history..."))
+                progress = self.backfill_progress[guild.id]
+                progress["reporters"].add(status)
                 try:
-                    async for message in channel.history(after=start_time, limit=None):
-                        total_messages += 1
-                        
-                        # Channel activity
-                        channel_messages[channel] += 1
-                        
-                        # User activity (skip bots)
-                        if not message.author.bot:
-                            user_messages[message.author] += 1
-                        
-                        # Emoji usage
-                        emojis = self.emoji_pattern.findall(message.content)
-                        emoji_usage.update(emojis)
-                        for reaction in message.reactions:
-                            if isinstance(reaction.emoji, str):
-                                emoji_usage[reaction.emoji] += reaction.count
-                        
-                        # Time analysis
-                        hour_activity[message.created_at.hour] += 1
-                        day_name = message.created_at.strftime('%A')
-                        day_activity[day_name] += 1
-
-                        # Update status every 1000 messages
-                        if total_messages % 1000 == 0:
-                            await status.edit(content=f"📊 Analyzed {total_messages:,} messages from {channels_processed}/{len(text_channels)} channels...")
-
-                    channels_processed += 1
-                    await status.edit(content=f"📊 Analyzed {total_messages:,} messages from {channels_processed}/{len(text_channels)} channels...")
-
-                except discord.Forbidden:
-                    continue
-                except Exception as e:
-                    print(f"Error in channel {channel.name}: {e}")
-                    continue
+                    await asyncio.shield(backfill)
+                finally:
+                    progress["reporters"].discard(status)
+
+            start_time = datetime.now(timezone.utc) - timedelta(days=days)
+            summary = await self.index.summary(guild.id, start_time)
+            indexed_since = await self.index.get_indexed_since(guild.id)
+            total_messages = summary["total"]
 
             # Create embed
             embed = discord.Embed(
-                title=f"📊 Message Analytics for {interaction.guild.name}",
+                title=f"📊 Message Analytics for {guild.name}",
                 description=f"Analysis of {total_messages:,} messages from the last {days} days",
                 color=discord.Color.blue(),
                 timestamp=datetime.now()
             )
 
             # Top Channels
-            top_channels = sorted(channel_messages.items(), key=lambda x: x[1], reverse=True)[:5]
-            channels_text = "\n".join(f"#{channel.name}: {count:,} messages" for channel, count in top_channels)
+            channels_text = "\n".join(
+                f"{self.channel_label(guild, channel_id)}: {count:,} messages"
+                for channel_id, count in summary["channels"]
+            )
             embed.add_field(name="📝 Most Active Channels", value=channels_text or "No data", inline=False)
 
             # Top Users
-            top_users = sorted(user_messages.items(), key=lambda x: x[1], reverse=True)[:5]
-            users_text = "\n".join(f"{user.display_name}: {count:,} messages" for user, count in top_users)
+            users_text = "\n".join(
+                f"{self.user_label(guild, user_id)}: {count:,} messages"
+                for user_id, count in summary["users"]
+            )
             embed.add_field(name="👥 Most Active Users", value=users_text or "No data", inline=False)
 
             # Top Emojis
-            top_emojis = sorted(emoji_usage.items(), key=lambda x: x[1], reverse=True)[:10]
-            emojis_text = "\n".join(f"{emoji}: {count}" for emoji, count in top_emojis)
+            emojis_text = "\n".join(f"{emoji}: {count}" for emoji, count in summary["emojis"])
             embed.add_field(name="😀 Most Used Emojis", value=emojis_text or "No emojis found", inline=False)
 
             # Most Active Times
-            most_active_hour = max(hour_activity.items(), key=lambda x: x[1])[0]
-            most_active_day = max(day_activity.items(), key=lambda x: x[1])[0]
-            
-            activity_info = (
-                f"⏰ Most Active Hour: {most_active_hour:02d}:00 UTC\n"
-                f"📅 Most Active Day: {most_active_day}\n"
-                f"💬 Total Messages: {total_messages:,}"
-            )
+            if summary["hours"]:
+                most_active_hour = max(summary["hours"].items(), key=lambda x: x[1])[0]
+                most_active_day = calendar.day_name[max(summary["weekdays"].items(), key=lambda x: x[1])[0]]
+                activity_info = (
+                    f"⏰ Most Active Hour: {most_active_hour:02d}:00 UTC\n"
+                    f"📅 Most Active Day: {most_active_day}\n"
+                    f"💬 Total Messages: {total_messages:,}"
+                )
+            else:
+                activity_info = "No messages in this period"
             embed.add_field(name="⚡ Activity Overview", value=activity_info, inline=False)
 
-            await status.delete()
+            footer = f"Answered from index in {summary['query_ms']:.0f} ms"
+            if indexed_since and indexed_since > start_time.timestamp():
+                footer += f" | Index covers activity since {datetime.fromtimestamp(indexed_since, timezone.utc).strftime('%Y-%m-%d')}"
+            embed.set_footer(text=footer)
+
+            if status:
+                await status.delete()
             await interaction.followup.send(embed=embed)
 
         except Exception as e:
-            await status.edit(content=f"An error occurred: {str(e)}")
+            if status:
+                await status.finish(content=f"An error occurred: {str(e)}")
+            else:
+                await interaction.followup.send(f"An error occurred: {str(e)}")
 
 async def setup(bot):
-    await bot.add_cog(MessageAnalytics(bot)) 
\ No newline at end of file
+    await bot.add_cog(MessageAnalytics(bot))
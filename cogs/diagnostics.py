@@ -0,0 +1,60 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from datetime import datetime
+
+class Diagnostics(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="cachestats", description="Show upstream response cache statistics")
+    async def cachestats(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        stats = self.bot.http_client.cache.stats()
+        inflight = self.bot.http_client.inflight
+        gemini = self.bot.gemini.stats()
+        batching = self.bot.question_batcher.stats()
+        sessions = self.bot.sessions.stats()
+        documents = await self.bot.documents.stats()
+        extraction = self.bot.extractor.stats()
+
+        embed = discord.Embed(
+            title="🗄️ Response Cache",
+            description=(
+                f"📦 Entries: {stats['entries']:,}\n"
+                f"💾 Size: {stats['bytes'] / 1024:,.1f} KB\n"
+                f"🧹 Evictions: {stats['evictions']:,}\n"
+                f"🔗 Upstream Calls: {inflight.calls:,} ({inflight.coalesced:,} coalesced, {inflight.in_flight():,} in flight)\n"
+                f"🎮 Reaction Routes: {len(self.bot.reactions.handlers):,} active, {self.bot.reactions.dispatched:,} dispatched\n"
+                f"🤖 Gemini Calls: {gemini['calls']:,} ({gemini['active']} running, {gemini['waiting']} waiting, {gemini['queued']:,} queued so far)\n"
+                f"📦 Quiz Requests: {batching['requests']:,} in {batching['calls']:,} calls ({batching['retries']:,} retried alone)\n"
+                f"🧠 Quiz Sessions: {sessions['entries']:,} entries ({sessions['pinned']:,} pinned), {sessions['bytes'] / 1024:,.1f} / {sessions['max_bytes'] / 1024:,.0f} KB "
+                f"({sessions['evictions']:,} evicted, {sessions['expirations']:,} expired)\n"
+                f"📄 Documents: {documents['documents']:,} cached, {documents['bytes'] / 1024:,.1f} KB "
+                f"({documents['hits']:,} hits, {documents['misses']:,} misses, {documents['evictions']:,} evicted)\n"
+                f"🗜️ Extraction Jobs: {extraction['jobs']:,} ({extraction['failures']:,} failed)"
+            ),
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+
+        for name, counters in sorted(stats['policies'].items()):
+            embed.add_field(
+                name=name,
+                value=(
+                    f"✅ Hits: {counters['hits']:,}\n"
+                    f"♻️ Stale: {counters['stale_hits']:,}\n"
+                    f"❌ Misses: {counters['misses']:,}\n"
+                    f"📈 Hit Rate: {counters['hit_rate'] * 100:.1f}%"
+                ),
+                inline=True
+            )
+
+        if not stats['policies']:
+            embed.add_field(name="No data", value="No cached lookups yet", inline=False)
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Diagnostics(bot))
@@ -3,10 +3,47 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
 import asyncio
+from utils.guild_index import GuildMemberIndex
 
 class DiscordStats(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.member_indexes = {}  # {guild_id: GuildMemberIndex}
+
+    def get_member_index(self, guild: discord.Guild) -> GuildMemberIndex:
+        """Return the guild's member index, building it from the member cache once"""
+        index = self.member_indexes.get(guild.id)
+        if index is None:
+            index = GuildMemberIndex([
+                (m.id, m.joined_at, m.bot, m.status != discord.Status.offline)
+                for m in guild.members
+            ])
+            self.member_indexes[guild.id] = index
+        return index
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        index = self.member_indexes.get(member.guild.id)
+        if index is not None:
+            index.add_member(member.id, member.bot, member.status != discord.Status.offline)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        index = self.member_indexes.get(member.guild.id)
+        if index is not None:
+            index.remove_member(member.id)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        if before.status == after.status:
+            return
+        index = self.member_indexes.get(after.guild.id)
+        if index is not None:
+            index.set_online(after.id, after.status != discord.Status.offline)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.member_indexes.pop(guild.id, None)
 
     @app_commands.command(name="serverstats", description="Get detailed server statistics")
     async def serverstats(self, interaction: discord.Interaction):
@@ -15,9 +52,10 @@ class DiscordStats(commands.Cog):
         guild = interaction.guild
         
         # Get member statistics
+        index = self.get_member_index(guild)
         total_members = guild.member_count
-        online_members = len([m for m in guild.members if m.status != discord.Status.offline])
-        bot_count = len([m for m in guild.members if m.bot])
+        online_members = index.online_count
+        bot_count = index.bot_count
         human_count = total_members - bot_count
 
         # Get channel statistics
@@ -96,7 +134,7 @@ class DiscordStats(commands.Cog):
         embed.add_field(name="Basic Information", value=basic_info, inline=False)
 
         # Dates
-        join_position = sorted(guild.members, key=lambda m: m.joined_at or datetime.max).index(user) + 1
+        join_position = self.get_member_index(guild).join_position(user.id)
         dates_info = (
             f"📅 Account Created: <t:{int(user.created_at.timestamp())}:R>\n"
             f"📥 Server Joined: <t:{int(user.joined_at.timestamp())}:R>\n"
@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 from datetime import datetime
 import asyncio
 
@@ -57,29 +56,28 @@ class Horoscope(commands.Cog):
                 "day": "today"
             }
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(self.base_url, params=params) as response:
-                    if response.status != 200:
-                        await interaction.followup.send("Failed to fetch horoscope. Please try again later.")
-                        return
-                    
-                    data = await response.json()
-                    
-                    if not data or "data" not in data:
-                        await interaction.followup.send("Invalid response from horoscope service.")
-                        return
+            status, data = await self.bot.http_client.fetch_json(
+                "GET", self.base_url, params=params, headers=self.headers, cache="horoscope"
+            )
+            if status != 200:
+                await interaction.followup.send("Failed to fetch horoscope. Please try again later.")
+                return
+            
+            if not data or "data" not in data:
+                await interaction.followup.send("Invalid response from horoscope service.")
+                return
 
-                    horoscope_data = data["data"]
-                    
-                    embed = discord.Embed(
-                        title=f"Daily Horoscope: {sign.title()} {self.signs[sign]}",
-                        description=horoscope_data.get("horoscope_data", "No horoscope available for today."),
-                        color=discord.Color.purple(),
-                        timestamp=datetime.now()
-                    )
+            horoscope_data = data["data"]
+            
+            embed = discord.Embed(
+                title=f"Daily Horoscope: {sign.title()} {self.signs[sign]}",
+                description=horoscope_data.get("horoscope_data", "No horoscope available for today."),
+                color=discord.Color.purple(),
+                timestamp=datetime.now()
+            )
 
-                    embed.set_footer(text=f"Date Range: {self.date_ranges[sign]}")
-                    await interaction.followup.send(embed=embed)
+            embed.set_footer(text=f"Date Range: {self.date_ranges[sign]}")
+            await interaction.followup.send(embed=embed)
 
         except Exception as e:
             await interaction.followup.send(f"An error occurred: {str(e)}")
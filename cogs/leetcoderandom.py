@@ -1,4 +1,3 @@
-import aiohttp
 import discord
 from discord.ext import commands
 import requests
@@ -79,55 +78,54 @@ class Leetcodeq(commands.Cog):
             variables["filters"] = {"difficulty": difficulty}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    'https://leetcode.com/graphql',
-                    headers=headers,
-                    json={"query": query, "variables": variables}
-                ) as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send(f"Failed to fetch problems. Status: {resp.status}")
-                        return
-                    
-                    data = await resp.json()
-                    
-                    if not data or 'data' not in data or 'problemsetQuestionList' not in data['data']:
-                        await interaction.followup.send("Invalid response format from LeetCode")
-                        return
+            status, data = await self.bot.http_client.fetch_json(
+                "POST",
+                'https://leetcode.com/graphql',
+                headers=headers,
+                json={"query": query, "variables": variables},
+                cache="leetcode_problemset"
+            )
+            if status != 200:
+                await interaction.followup.send(f"Failed to fetch problems. Status: {status}")
+                return
+            
+            if not data or 'data' not in data or 'problemsetQuestionList' not in data['data']:
+                await interaction.followup.send("Invalid response format from LeetCode")
+                return
 
-                    questions = [q for q in data['data']['problemsetQuestionList']['questions'] 
-                               if not q['isPaidOnly']]
+            questions = [q for q in data['data']['problemsetQuestionList']['questions'] 
+                       if not q['isPaidOnly']]
 
-                    if not questions:
-                        await interaction.followup.send("No problems found with the given criteria.")
-                        return
+            if not questions:
+                await interaction.followup.send("No problems found with the given criteria.")
+                return
 
-                    selected_problems = random.sample(questions, min(5, len(questions)))
-                    
-                    embed = discord.Embed(
-                        title="🎲 Random LeetCode Problems",
-                        description=f"Here are {'5' if len(selected_problems) == 5 else len(selected_problems)} random "
-                                   f"{difficulty.lower() + ' ' if difficulty else ''}problems:",
-                        color=discord.Color.blue()
-                    )
+            selected_problems = random.sample(questions, min(5, len(questions)))
+            
+            embed = discord.Embed(
+                title="🎲 Random LeetCode Problems",
+                description=f"Here are {'5' if len(selected_problems) == 5 else len(selected_problems)} random "
+                           f"{difficulty.lower() + ' ' if difficulty else ''}problems:",
+                color=discord.Color.blue()
+            )
 
-                    difficulty_emojis = {
-                        'EASY': '🟢',
-                        'MEDIUM': '🟡',
-                        'HARD': '🔴'
-                    }
+            difficulty_emojis = {
+                'EASY': '🟢',
+                'MEDIUM': '🟡',
+                'HARD': '🔴'
+            }
 
-                    for problem in selected_problems:
-                        problem_url = f'https://leetcode.com/problems/{problem["titleSlug"]}/'
-                        difficulty_emoji = difficulty_emojis.get(problem['difficulty'], '❓')
-                        embed.add_field(
-                            name=f"{difficulty_emoji} {problem['title']}",
-                            value=f"[Solve Problem]({problem_url})",
-                            inline=False
-                        )
+            for problem in selected_problems:
+                problem_url = f'https://leetcode.com/problems/{problem["titleSlug"]}/'
+                difficulty_emoji = difficulty_emojis.get(problem['difficulty'], '❓')
+                embed.add_field(
+                    name=f"{difficulty_emoji} {problem['title']}",
+                    value=f"[Solve Problem]({problem_url})",
+                    inline=False
+                )
 
-                    await interaction.followup.send(embed=embed)
-                    
+            await interaction.followup.send(embed=embed)
+            
         except Exception as e:
             await interaction.followup.send(f"An error occurred: {str(e)}")
 
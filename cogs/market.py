@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 from datetime import datetime
 import asyncio
 import os
@@ -51,57 +50,56 @@ class Market(commands.Cog):
                 "apikey": ALPHA_VANTAGE_KEY
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.base_url, params=params) as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send("Failed to fetch market data. Please try again later.")
-                        return
-                    
-                    data = await resp.json()
-                    
-                    if "Error Message" in data:
-                        await interaction.followup.send("No data available for this symbol.")
-                        return
+            status, data = await self.bot.http_client.fetch_json(
+                "GET", self.base_url, params=params, cache="market"
+            )
+            if status != 200:
+                await interaction.followup.send("Failed to fetch market data. Please try again later.")
+                return
+            
+            if "Error Message" in data:
+                await interaction.followup.send("No data available for this symbol.")
+                return
 
-                    # Get the time series data
-                    time_series_key = [key for key in data.keys() if "Time Series" in key][0]
-                    time_series = data[time_series_key]
-                    latest_data = list(time_series.items())[0][1]
+            # Get the time series data
+            time_series_key = [key for key in data.keys() if "Time Series" in key][0]
+            time_series = data[time_series_key]
+            latest_data = list(time_series.items())[0][1]
 
-                    # Extract prices
-                    current_price = float(latest_data.get("4. close", 0))
-                    high_price = float(latest_data.get("2. high", 0))
-                    low_price = float(latest_data.get("3. low", 0))
-                    open_price = float(latest_data.get("1. open", 0))
+            # Extract prices
+            current_price = float(latest_data.get("4. close", 0))
+            high_price = float(latest_data.get("2. high", 0))
+            low_price = float(latest_data.get("3. low", 0))
+            open_price = float(latest_data.get("1. open", 0))
 
-                    # Calculate change
-                    change = current_price - open_price
-                    change_percent = (change / open_price) * 100
-                    emoji = "🟢" if change >= 0 else "🔴"
+            # Calculate change
+            change = current_price - open_price
+            change_percent = (change / open_price) * 100
+            emoji = "🟢" if change >= 0 else "🔴"
 
-                    embed = discord.Embed(
-                        title=f"📊 Market Data: {symbol.upper()}",
-                        color=discord.Color.green() if change >= 0 else discord.Color.red(),
-                        timestamp=datetime.now()
-                    )
+            embed = discord.Embed(
+                title=f"📊 Market Data: {symbol.upper()}",
+                color=discord.Color.green() if change >= 0 else discord.Color.red(),
+                timestamp=datetime.now()
+            )
 
-                    # Current price and change
-                    price_info = (
-                        f"💰 Current Price: ${current_price:,.2f}\n"
-                        f"{emoji} Change: {change_percent:+.2f}%\n"
-                        f"📈 Open: ${open_price:,.2f}"
-                    )
-                    embed.add_field(name="Price Information", value=price_info, inline=False)
+            # Current price and change
+            price_info = (
+                f"💰 Current Price: ${current_price:,.2f}\n"
+                f"{emoji} Change: {change_percent:+.2f}%\n"
+                f"📈 Open: ${open_price:,.2f}"
+            )
+            embed.add_field(name="Price Information", value=price_info, inline=False)
 
-                    # Trading range
-                    range_info = (
-                        f"⬆️ High: ${high_price:,.2f}\n"
-                        f"⬇️ Low: ${low_price:,.2f}"
-                    )
-                    embed.add_field(name="Today's Range", value=range_info, inline=True)
+            # Trading range
+            range_info = (
+                f"⬆️ High: ${high_price:,.2f}\n"
+                f"⬇️ Low: ${low_price:,.2f}"
+            )
+            embed.add_field(name="Today's Range", value=range_info, inline=True)
 
-                    embed.set_footer(text="Data provided by Alpha Vantage")
-                    await interaction.followup.send(embed=embed)
+            embed.set_footer(text="Data provided by Alpha Vantage")
+            await interaction.followup.send(embed=embed)
 
         except Exception as e:
             await interaction.followup.send(f"An error occurred: {str(e)}")
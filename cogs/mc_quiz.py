@@ -2,10 +2,6 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-import io
-from pptx import Presentation
-import docx
-import PyPDF2
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
@@ -13,7 +9,18 @@ import traceback
 from .presentation_trivia import PresentationTriviaView
 import random
 import json
-import time
+import re
+from typing import Optional
+from utils.progress import ProgressReporter
+from utils.pipeline import Prefetcher
+from utils.extraction import ExtractionError
+from utils.document_cache import digest
+from utils.similarity import NearDuplicateFilter
+from utils.question_stream import QuestionStream
+
+def normalize_topic(topic: str) -> str:
+    """Bank key for a topic, so "Python", "python " and "python?" share questions"""
+    return re.sub(r'\s+', ' ', topic).strip().lower().rstrip('?!.')
 
 class MCQuestionView(discord.ui.View):
     def __init__(self, quiz_session):
@@ -57,7 +64,7 @@ class ContentChoiceView(discord.ui.View):
     @discord.ui.button(label="Use Previous Content", style=discord.ButtonStyle.primary, emoji="🔄")
     async def use_previous(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
-        content = self.cog.user_content.get(interaction.user.id)
+        content = await self.cog.get_user_content(interaction.user.id)
         if content:
             for item in self.children:
                 item.disabled = True
@@ -91,14 +98,20 @@ class ContentChoiceView(discord.ui.View):
             
             if msg.attachments:
                 file = msg.attachments[0]
-                if not any(file.filename.endswith(ext) for ext in ['.txt', '.pdf', '.docx', '.pptx']):
+                if not self.cog.bot.extractor.supports(file.filename):
                     await interaction.followup.send(
                         "Invalid file type. Please use .txt, .pdf, .docx, or .pptx files."
                     )
                     return
                     
                 file_data = await file.read()
-                content = await self.cog.process_file(file_data, file.filename, interaction)
+                try:
+                    content = await self.cog.bot.documents.extract(file_data, file.filename, self.cog.bot.extractor.extract)
+                except ExtractionError as e:
+                    await interaction.followup.send(
+                        f"Error processing file: {str(e)}. Please try a different file or paste the content directly."
+                    )
+                    return
             else:
                 content = msg.content
 
@@ -115,28 +128,53 @@ class ContentChoiceView(discord.ui.View):
             await interaction.followup.send("No input received within 5 minutes. Please try again.")
 
 class MCQuiz(commands.Cog):
+    CONTENT_NAMESPACE = "mcquiz_documents"  # {user_id: document digest}; the text lives in the document cache
+    CONTENT_TTL = 30 * 24 * 3600  # Keep persisted topics/content for 30 days
+
     def __init__(self, bot):
         self.bot = bot
         # Initialize Gemini like PresentationTrivia
         load_dotenv()
         genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
         self.model = genai.GenerativeModel('gemini-2.0-flash')
-        self.user_content = {}
-        self.used_questions = {}
-        self.active_quizzes = {}  # Track active quiz sessions
-        self.question_cache = {}  # Cache for generated questions
+        # Per-user state and topic banks live in the bot-wide session store (bounded, evicted when idle)
+        self.user_content = bot.sessions.namespace("mcquiz.content")
+        self.used_questions = bot.sessions.namespace("mcquiz.used")
+        self.question_cache = bot.sessions.namespace("mcquiz.bank")  # Question bank per topic document, shared by every user
         self.MAX_CACHE_SIZE = 1000  # Maximum questions to cache per topic
+        self.BATCH_SIZE = 15  # Questions served per round
+        self.BANK_LOW_WATER = 10  # Refill a topic's bank once a player has fewer unseen questions left
+        self.refills = {}  # {document: QuestionStream} of the one Gemini refill running per topic
+        self.background_tasks = set()
         self.MAX_ACTIVE_QUIZZES = 5  # Maximum concurrent quizzes per channel
-        self.CLEANUP_DELAY = 3600  # Clear inactive sessions after 1 hour
-        # Start the cleanup task
-        self.cleanup_task = None
+        self.prefetch_depth = int(os.getenv('QUIZ_PREFETCH_DEPTH', 1))  # Batches generated ahead of the player
+        # Reworded repeats of earlier questions, and when a topic has nothing new left
+        self.near_duplicates = NearDuplicateFilter(threshold=float(os.getenv('QUIZ_SIMILARITY_THRESHOLD', 0.6)))
+        self.exhausted_rate = float(os.getenv('QUIZ_EXHAUSTED_DUPLICATE_RATE', 0.8))
+
+    async def get_user_content(self, user_id: int) -> Optional[str]:
+        """Return the user's last content, rehydrating it from the store after a restart"""
+        content = self.user_content.get(user_id)
+        if content is None:
+            document = await self.bot.store.get(self.CONTENT_NAMESPACE, user_id)
+            content = await self.bot.documents.get_text(document) if document else None
+            if content:
+                self.user_content[user_id] = content
+        return content
+
+    async def save_user_content(self, user_id: int, content: str) -> str:
+        """Remember the user's content in memory and persist its document digest; returns the digest"""
+        self.user_content[user_id] = content
+        document = await self.bot.documents.put_text(content)
+        await self.bot.store.set(self.CONTENT_NAMESPACE, user_id, document, ttl=self.CONTENT_TTL)
+        return document
 
     @app_commands.command(name="mcquiz", description="Generate multiple-choice questions on a topic or from content")
     @app_commands.describe(new_content="Start with new content? Default: Use previous content if available")
     async def mc_quiz(self, interaction: discord.Interaction, new_content: bool = False):
         await interaction.response.defer()
 
-        if not new_content and interaction.user.id in self.user_content:
+        if not new_content and await self.get_user_content(interaction.user.id):
             embed = discord.Embed(
                 title="📝 Multiple Choice Quiz",
                 description="Would you like to use your previous content or provide new content/topic?",
@@ -163,14 +201,20 @@ class MCQuiz(commands.Cog):
             
             if msg.attachments:
                 file = msg.attachments[0]
-                if not any(file.filename.endswith(ext) for ext in ['.txt', '.pdf', '.docx', '.pptx']):
+                if not self.bot.extractor.supports(file.filename):
                     await interaction.followup.send(
                         "Invalid file type. Please use .txt, .pdf, .docx, or .pptx files."
                     )
                     return
                     
                 file_data = await file.read()
-                content = await self.process_file(file_data, file.filename, interaction)
+                try:
+                    content = await self.bot.documents.extract(file_data, file.filename, self.bot.extractor.extract)
+                except ExtractionError as e:
+                    await interaction.followup.send(
+                        f"Error processing file: {str(e)}. Please try a different file or paste the content directly."
+                    )
+                    return
             else:
                 content = msg.content
 
@@ -186,65 +230,16 @@ class MCQuiz(commands.Cog):
         except asyncio.TimeoutError:
             await interaction.followup.send("No input received within 5 minutes. Please try again.")
 
-    async def process_file(self, file_data: bytes, filename: str, interaction: discord.Interaction = None) -> str:
-        """Process different file types and extract text contents"""
-        try:
-            text_content = ""
-            
-            if filename.endswith('.pptx'):
-                presentation = Presentation(io.BytesIO(file_data))
-                text_content = []
-                
-                for slide in presentation.slides:
-                    for shape in slide.shapes:
-                        if hasattr(shape, "text") and shape.text.strip():
-                            text_content.append(shape.text.strip())
-                        
-                        if shape.has_table:
-                            for row in shape.table.rows:
-                                for cell in row.cells:
-                                    if cell.text.strip():
-                                        text_content.append(cell.text.strip())
-                        
-                        if hasattr(shape, "text_frame"):
-                            for paragraph in shape.text_frame.paragraphs:
-                                if paragraph.text.strip():
-                                    text_content.append(paragraph.text.strip())
-
-                return "\n".join(text_content)
-            
-            elif filename.endswith('.docx'):
-                doc = docx.Document(io.BytesIO(file_data))
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        text_content += paragraph.text.strip() + "\n"
-                    
-            elif filename.endswith('.pdf'):
-                pdf = PyPDF2.PdfReader(io.BytesIO(file_data))
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text.strip():
-                        text_content += text.strip() + "\n"
-                    
-            elif filename.endswith('.txt'):
-                text_content = file_data.decode('utf-8')
-            
-            return text_content.strip()
-            
-        except Exception as e:
-            print(f"Error processing file {filename}: {str(e)}")
-            if interaction:
-                await interaction.followup.send(
-                    f"Error processing file: {str(e)}. Please try a different file or paste the content directly."
-                )
-            return ""
+    async def generate_questions(self, topic: str, user_id: int = None, interaction: discord.Interaction = None,
+                                 scope: str = None, stream: QuestionStream = None) -> list:
+        """Generate multiple choice questions about a topic using Gemini AI
 
-    async def generate_questions(self, topic: str, user_id: int = None, interaction: discord.Interaction = None) -> list:
-        """Generate multiple choice questions about a topic using Gemini AI"""
+        Each question is added to ``stream`` (if given) as soon as Gemini has streamed it in.
+        """
+        scope = scope or f"mcquiz:{user_id}"
+        if stream is None:
+            stream = QuestionStream()
         try:
-            if user_id not in self.used_questions:
-                self.used_questions[user_id] = set()
-
             prompt = f"""You are a quiz generator. Generate multiple-choice questions about this topic.
 
 REQUIRED FORMAT (with proper spacing):
@@ -280,106 +275,173 @@ CRITICAL RULES:
 
 Topic to use: {topic}"""
 
-            print("Sending request to Gemini...")
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
-            
-            try:
-                # Clean the response text
-                response_text = response.text.strip()
-                if response_text.startswith('```json'):
-                    response_text = response_text[7:-3]  # Remove ```json and ``` markers
-                
-                # Parse the JSON response
-                questions_data = json.loads(response_text)
-                questions = questions_data.get('questions', [])
-                
-                if not questions:
-                    print("No questions found in response")
-                    return []
-
-                # Filter out previously used questions
-                questions = [q for q in questions 
-                           if hash(q.get('question', '')) not in self.used_questions[user_id]]
-                
-                # Validate question format
-                valid_questions = []
-                for q in questions:
-                    if all(key in q for key in ['question', 'correct_answer', 'incorrect_answers', 'explanation']):
-                        if isinstance(q['incorrect_answers'], list) and len(q['incorrect_answers']) == 3:
-                            valid_questions.append(q)
-                
-                # Track newly used questions
-                for q in valid_questions:
-                    self.used_questions[user_id].add(hash(q['question']))
-                
-                print(f"Generated {len(valid_questions)} valid questions")
-                return valid_questions
+            def accept(q):
+                """Validate one question as soon as it has streamed in"""
+                if all(key in q for key in ['question', 'correct_answer', 'incorrect_answers', 'explanation']):
+                    if isinstance(q['incorrect_answers'], list) and len(q['incorrect_answers']) == 3:
+                        # Drop repeats and rewordings of questions already generated in this scope
+                        if self.near_duplicates.filter(scope, [q]):
+                            return q
+                return None
 
-            except json.JSONDecodeError as e:
-                print(f"Error parsing JSON: {str(e)}")
-                print(f"Raw response: {response.text}")
-                
-                # Attempt to clean and retry parsing
-                try:
-                    # Remove any potential markdown formatting
-                    cleaned_text = response.text.replace('```json\n', '').replace('\n```', '').strip()
-                    questions_data = json.loads(cleaned_text)
-                    questions = questions_data.get('questions', [])
-                    return questions
-                except:
-                    print("Failed to parse even after cleaning")
-                    return []
+            print("Streaming request to Gemini...")
+            await self.bot.question_batcher.generate(self.model, prompt, stream, accept, owner=user_id)
+            print(f"Generated {len(stream)} valid questions")
+            return stream.questions
 
         except Exception as e:
             print(f"Error generating questions: {str(e)}")
+            stream.finish(e)
             if interaction:
                 await interaction.followup.send("Error generating questions. Please try again.")
             return []
 
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def _load_bank(self, document: str) -> list:
+        """A topic's question bank, loaded from the document cache on first use"""
+        bank = self.question_cache.get(document)
+        if bank is None:
+            batches = await self.bot.documents.get_batches(document)
+            bank = [q for batch in batches.values() for q in batch][-self.MAX_CACHE_SIZE:]
+            # Another session may have loaded it while we were reading
+            bank = self.question_cache.setdefault(document, bank)
+        # The near-duplicate index has its own LRU and may have dropped the scope while the bank stayed resident
+        if f"bank:{document}" not in self.near_duplicates:
+            self.near_duplicates.seed(f"bank:{document}", (q['question'] for q in bank))
+        return bank
+
+    def clear_user_cache(self, user_id: int):
+        """Clear quiz-specific cache for a user"""
+        self.used_questions.pop(user_id, None)
+
+    def _unseen(self, document: str, used, dealt: set) -> list:
+        return [q for q in self.question_cache.get(document, []) if q['question'] not in used and q['question'] not in dealt]
+
+    def _serve(self, document: str, used, dealt: set) -> list:
+        """Up to BATCH_SIZE random bank questions this player has not seen or been dealt this session"""
+        unseen = self._unseen(document, used, dealt)
+        batch = random.sample(unseen, min(self.BATCH_SIZE, len(unseen)))
+        # Only marked as used once shown, so a prefetched batch the player never reaches stays available
+        dealt.update(q['question'] for q in batch)
+        return batch
+
+    def _refill_bank(self, topic: str, document: str, user_id: int) -> QuestionStream:
+        """Start (or join) the Gemini refill of a topic's bank; its questions stream in as they are generated"""
+        stream = self.refills.get(document)
+        if stream is not None and not stream.complete:
+            return stream
+        bank_scope = f"bank:{document}"
+        # Stop paying for calls once most of what comes back is a repeat
+        if self.near_duplicates.duplicate_rate(bank_scope) >= self.exhausted_rate:
+            print(f"Topic exhausted for {bank_scope}, not generating more questions")
+            return QuestionStream.from_list([])
+        stream = QuestionStream()
+        self.refills[document] = stream
+        self._spawn(self._run_refill(topic, document, user_id, stream))
+        return stream
+
+    async def _run_refill(self, topic: str, document: str, user_id: int, stream: QuestionStream):
+        """Generate one more batch into the topic's bank and persist it"""
+        try:
+            questions = await self.generate_questions(topic, user_id, scope=f"bank:{document}", stream=stream)
+        finally:
+            if self.refills.get(document) is stream:
+                del self.refills[document]
+        if questions:
+            # Reload an evicted bank first, or it would be replaced by just this refill
+            bank = await self._load_bank(document)
+            bank.extend(questions)
+            del bank[:-self.MAX_CACHE_SIZE]
+            self.question_cache.touch(document)
+            try:
+                await self.bot.documents.put_batch(document, digest(json.dumps(questions))[:16], questions)
+            except Exception as e:
+                print(f"Failed to persist question bank for bank:{document}: {e}")
+
+    async def _forward_unseen(self, source: QuestionStream, target: QuestionStream, used, dealt: set):
+        """Pass a shared refill's questions this player has not seen on to their own stream"""
+        try:
+            async for question in source.follow():
+                if question['question'] not in used and question['question'] not in dealt:
+                    dealt.add(question['question'])
+                    target.add(question)
+        finally:
+            target.finish(source.error)
+
     async def start_mc_quiz(self, interaction: discord.Interaction, topic: str):
         """Start a continuous multiple choice quiz session on a topic"""
+        progress = ProgressReporter(send=interaction.followup.send)
+        # Questions come from the topic's shared bank; Gemini only tops it up
+        document = await self.bot.documents.put_text(normalize_topic(topic))
+        bank_scope = f"bank:{document}"
+        # Questions this user was already asked about this topic/content, kept across restarts
+        used = await self.bot.dedup.load(f"mcquiz:{interaction.user.id}:{document}")
+        self.used_questions[interaction.user.id] = used
+
+        streaming = None  # Refill currently being streamed straight to this player
+        dealt = set()     # Questions handed to this session's batches; `used` only records the ones shown
+
+        async def next_batch():
+            nonlocal streaming
+            # The bank may have been evicted from the session store while idle
+            await self._load_bank(document)
+            batch = self._serve(document, used, dealt)
+            if not batch and streaming is not None:
+                # Let the refill this player is already playing land in the bank first
+                await streaming.wait_complete()
+                batch = self._serve(document, used, dealt)
+            if len(self._unseen(document, used, dealt)) < self.BANK_LOW_WATER:
+                # Shared with anyone else on the topic
+                refill = self._refill_bank(topic, document, interaction.user.id)
+                if not batch:
+                    # Nothing unseen left; play the refill's questions as they stream in
+                    streaming = QuestionStream()
+                    self._spawn(self._forward_unseen(refill, streaming, used, dealt))
+                    await streaming.wait_for(1)
+                    return streaming if streaming.questions else []
+            return QuestionStream.from_list(batch)
+
+        batches = Prefetcher(next_batch, depth=self.prefetch_depth)
+        score = 0
+        current_question = 0
+        view = PresentationTriviaView(self, interaction)
+        self.used_questions.pin(interaction.user.id)
         try:
-            self.user_content[interaction.user.id] = topic
-            view = PresentationTriviaView(self, interaction)
-            score = 0
-            current_question = 0
-
-            # Initialize used questions set if it doesn't exist
-            if interaction.user.id not in self.used_questions:
-                self.used_questions[interaction.user.id] = set()
+            await self.save_user_content(interaction.user.id, topic)
 
-            progress = discord.Embed(
+            progress.update(embed=discord.Embed(
                 title="📝 Multiple Choice Quiz",
-                description=f"Topic: {topic}\nCurrent Score: {score}/{current_question}\nGenerating questions...\nPreviously answered questions: {len(self.used_questions[interaction.user.id])}",
+                description=f"Topic: {topic}\nCurrent Score: {score}/{current_question}\nGenerating questions...\nPreviously answered questions: {len(used)}",
                 color=discord.Color.blue()
-            )
-            await interaction.followup.send(embed=progress)
+            ))
 
             while view.active:
-                # Generate new batch of questions (without clearing used_questions)
-                questions = await self.generate_questions(topic, interaction.user.id, interaction)
+                # Next batch of questions (without clearing used_questions)
+                questions = await batches.next()
                 
                 if not questions:
                     final_embed = discord.Embed(
                         title="⚠️ Generation Error",
-                        description=f"Failed to generate new questions. {len(self.used_questions[interaction.user.id])} questions have been asked about this topic.\nTry a different topic or aspect!",
+                        description=f"Failed to generate new questions. {len(used)} questions have been asked about this topic.\nRecent duplicate rate: {self.near_duplicates.duplicate_rate(bank_scope) * 100:.0f}%\nTry a different topic or aspect!",
                         color=discord.Color.red()
                     )
                     await interaction.followup.send(embed=final_embed)
                     break
 
-                # Notify user of new batch
-                batch_embed = discord.Embed(
+                # Notify user of new batch on the progress message
+                progress.update(embed=discord.Embed(
                     title="🎯 New Questions Generated!",
-                    description=f"Generated {len(questions)} new questions about {topic}.\nTotal unique questions asked: {len(self.used_questions[interaction.user.id])}",
+                    description=f"Generated {len(questions)}{'' if questions.complete else '+'} new questions about {topic}.\nTotal unique questions asked: {len(used)}\nDuplicate rate: {self.near_duplicates.duplicate_rate(bank_scope) * 100:.0f}%",
                     color=discord.Color.green()
-                )
-                await interaction.followup.send(embed=batch_embed)
+                ))
                 await asyncio.sleep(2)
 
-                for question in questions:
+                async for question in questions:
                     if not view.active:
                         break
 
@@ -401,13 +463,16 @@ Topic to use: {topic}"""
                         )
 
                     msg = await interaction.followup.send(embed=question_embed, view=view)
+                    used.add(question['question'])
 
-                    # Add reactions
+                    # Add reactions in the background; answers count as soon as the question is up
                     reactions = ["🇦", "🇧", "🇨", "🇩"]
-                    for reaction in reactions:
-                        await msg.add_reaction(reaction)
+                    seeding = self.bot.reactions.seed(msg, reactions)
 
-                    reaction, user = await view.wait_for_answer(self.bot, msg, reactions)
+                    try:
+                        emoji, user = await view.wait_for_answer(self.bot, msg, reactions)
+                    finally:
+                        seeding.cancel()
                     
                     if not view.active:  # If quiz was ended
                         final_embed = discord.Embed(
@@ -418,7 +483,7 @@ Topic to use: {topic}"""
                         await interaction.followup.send(embed=final_embed)
                         return
 
-                    if not reaction:  # If we timed out
+                    if not emoji:  # If we timed out
                         timeout_embed = discord.Embed(
                             title="⏰ Time's Up!",
                             description=f"The correct answer was: **{question['correct_answer']}**\nFinal Score: {score}/{current_question}",
@@ -428,7 +493,7 @@ Topic to use: {topic}"""
                         break
 
                     # Process answer
-                    selected_idx = reactions.index(str(reaction.emoji))
+                    selected_idx = reactions.index(emoji)
                     selected_answer = all_answers[selected_idx]
                     is_correct = selected_answer == question['correct_answer']
 
@@ -458,44 +523,19 @@ Topic to use: {topic}"""
             if view.active:
                 traceback.print_exc()
                 await interaction.followup.send(f"An error occurred: {str(e)}")
-
-    async def cog_load(self):
-        """Called when the cog is loaded"""
-        self.cleanup_task = self.bot.loop.create_task(self._cleanup_inactive_sessions())
+        finally:
+            batches.close()
+            self.used_questions.unpin(interaction.user.id)
+            await progress.finish(embed=discord.Embed(
+                title="📝 Multiple Choice Quiz",
+                description=f"Topic: {topic}\nQuiz finished after {current_question} question(s).\nFinal Score: {score}/{current_question}",
+                color=discord.Color.gold()
+            ))
 
     async def cog_unload(self):
         """Called when the cog is unloaded"""
-        if self.cleanup_task:
-            self.cleanup_task.cancel()
-
-    async def _cleanup_inactive_sessions(self):
-        """Remove inactive quiz sessions and clear cache periodically"""
-        try:
-            while True:
-                current_time = time.time()
-                # Clear inactive sessions
-                inactive = [user_id for user_id, data in self.active_quizzes.items() 
-                          if current_time - data['last_activity'] > self.CLEANUP_DELAY]
-                
-                for user_id in inactive:
-                    if user_id in self.active_quizzes:
-                        del self.active_quizzes[user_id]
-                    if user_id in self.used_questions:
-                        del self.used_questions[user_id]
-                    if user_id in self.user_content:
-                        del self.user_content[user_id]
-                
-                # Clear old cache entries
-                for topic in list(self.question_cache.keys()):
-                    if len(self.question_cache[topic]) > self.MAX_CACHE_SIZE:
-                        self.question_cache[topic] = self.question_cache[topic][-self.MAX_CACHE_SIZE:]
-                
-                await asyncio.sleep(self.CLEANUP_DELAY)
-        except asyncio.CancelledError:
-            # Handle cleanup task cancellation
-            pass
-        except Exception as e:
-            print(f"Error in cleanup task: {e}")
+        for task in list(self.background_tasks):
+            task.cancel()
 
 class MCQuizSession:
     def __init__(self, bot, interaction, questions):
@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 from datetime import datetime, timezone, timedelta
 import pytz
 
@@ -78,86 +77,85 @@ class NBASchedule(commands.Cog):
             week_end = current_date + timedelta(days=7)
             date_range = f"{current_date.strftime('%Y%m%d')}-{week_end.strftime('%Y%m%d')}"
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                url = f"{self.base_url}/scoreboard?dates={date_range}"
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send("Failed to fetch NBA schedule. Please try again later.")
-                        return
-                    
-                    data = await resp.json()
-                    events = data.get("events", [])
-
-                    if not events:
-                        await interaction.followup.send("No games found for this week.")
-                        return
-
-                    embed = discord.Embed(
-                        title="🏀 NBA Games This Week",
-                        color=discord.Color.blue()
-                    )
-
-                    upcoming_games = []
-                    for event in events:
-                        try:
-                            game_date = datetime.strptime(event["date"], "%Y-%m-%dT%H:%M%z")
-                            upcoming_games.append((game_date, event))
-                        except (ValueError, KeyError):
-                            continue
-
-                    upcoming_games.sort(key=lambda x: x[0])
-
-                    if not upcoming_games:
-                        await interaction.followup.send("No games scheduled for this week.")
-                        return
-
-                    # Group games by date
-                    current_date = None
-                    games_text = ""
-                    
-                    for game_date, event in upcoming_games:
-                        date_str = game_date.strftime('%Y-%m-%d')
-                        
-                        if date_str != current_date:
-                            if games_text:
-                                embed.add_field(
-                                    name=f"📅 {current_date_display}",
-                                    value=games_text,
-                                    inline=False
-                                )
-                                games_text = ""
-                            
-                            current_date = date_str
-                            current_date_display = game_date.strftime('%A, %B %d')
-                            games_text = ""
-
-                        competition = event["competitions"][0]
-                        home_team = competition["competitors"][0]["team"]["abbreviation"]
-                        away_team = competition["competitors"][1]["team"]["abbreviation"]
-                        
-                        broadcasts = competition.get("broadcasts", [])
-                        broadcast_info = "TBD"
-                        if broadcasts:
-                            broadcast_names = [b.get("names", [""])[0] for b in broadcasts]
-                            broadcast_info = ", ".join(filter(None, broadcast_names))
-
-                        game_text = (
-                            f"{self.get_team_display(away_team)} @ {self.get_team_display(home_team)}\n"
-                            f"{self.format_game_time(game_date)}\n"
-                            f"📺 {broadcast_info}\n"
-                            "───────────────\n"
-                        )
-                        games_text += game_text
-
-                    # Add the last day's games
+            url = f"{self.base_url}/scoreboard?dates={date_range}"
+            status, data = await self.bot.http_client.fetch_json(
+                "GET", url, headers=self.headers, cache="espn_scoreboard"
+            )
+            if status != 200:
+                await interaction.followup.send("Failed to fetch NBA schedule. Please try again later.")
+                return
+            events = data.get("events", [])
+
+            if not events:
+                await interaction.followup.send("No games found for this week.")
+                return
+
+            embed = discord.Embed(
+                title="🏀 NBA Games This Week",
+                color=discord.Color.blue()
+            )
+
+            upcoming_games = []
+            for event in events:
+                try:
+                    game_date = datetime.strptime(event["date"], "%Y-%m-%dT%H:%M%z")
+                    upcoming_games.append((game_date, event))
+                except (ValueError, KeyError):
+                    continue
+
+            upcoming_games.sort(key=lambda x: x[0])
+
+            if not upcoming_games:
+                await interaction.followup.send("No games scheduled for this week.")
+                return
+
+            # Group games by date
+            current_date = None
+            games_text = ""
+            
+            for game_date, event in upcoming_games:
+                date_str = game_date.strftime('%Y-%m-%d')
+                
+                if date_str != current_date:
                     if games_text:
                         embed.add_field(
                             name=f"📅 {current_date_display}",
                             value=games_text,
                             inline=False
                         )
+                        games_text = ""
+                    
+                    current_date = date_str
+                    current_date_display = game_date.strftime('%A, %B %d')
+                    games_text = ""
 
-                    await interaction.followup.send(embed=embed)
+                competition = event["competitions"][0]
+                home_team = competition["competitors"][0]["team"]["abbreviation"]
+                away_team = competition["competitors"][1]["team"]["abbreviation"]
+                
+                broadcasts = competition.get("broadcasts", [])
+                broadcast_info = "TBD"
+                if broadcasts:
+                    broadcast_names = [b.get("names", [""])[0] for b in broadcasts]
+                    broadcast_info = ", ".join(filter(None, broadcast_names))
+
+                game_text = (
+                    f"{self.get_team_display(away_team)} @ {self.get_team_display(home_team)}\n"
+                    f"{self.format_game_time(game_date)}\n"
+                    f"📺 {broadcast_info}\n"
+                    "───────────────\n"
+                )
+                games_text += game_text
+
+            # Add the last day's games
+            if games_text:
+                embed.add_field(
+                    name=f"📅 {current_date_display}",
+                    value=games_text,
+                    inline=False
+                )
+
+            await interaction.followup.send(embed=embed)
 
         except discord.errors.NotFound:
             # If interaction has expired, ignore the error
@@ -177,107 +175,107 @@ class NBASchedule(commands.Cog):
         team_abbr = self.team_mapping[team]
 
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(f"{self.base_url}/teams/{team_abbr}/schedule") as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send("Failed to fetch NBA schedule. Please try again later.")
-                        return
+            status, data = await self.bot.http_client.fetch_json(
+                "GET", f"{self.base_url}/teams/{team_abbr}/schedule",
+                headers=self.headers, cache="espn_team_schedule"
+            )
+            if status != 200:
+                await interaction.followup.send("Failed to fetch NBA schedule. Please try again later.")
+                return
+            events = data.get("events", [])
+
+            if not events:
+                await interaction.followup.send("No games found for this team.")
+                return
+
+            current_time = datetime.now(timezone.utc)
+            upcoming_games = []
+            past_games = []
+
+            for event in events:
+                try:
+                    game_date = datetime.strptime(event["date"], "%Y-%m-%dT%H:%M%z")
+                    if game_date > current_time:
+                        upcoming_games.append((game_date, event))
+                    else:
+                        past_games.append((game_date, event))
+                except (ValueError, KeyError):
+                    continue
+
+            upcoming_games.sort(key=lambda x: x[0])
+            past_games.sort(key=lambda x: x[0], reverse=True)
+
+            if recent_game:
+                if not upcoming_games:
+                    await interaction.followup.send("No upcoming games found for this team.")
+                    return
+
+                # Show only the next upcoming game
+                next_game_date, next_game_event = upcoming_games[0]
+                embed = discord.Embed(
+                    title=f"🏀 Next Game for {team.title()}",
+                    color=discord.Color.blue()
+                )
+
+                competition = next_game_event["competitions"][0]
+                home_team = competition["competitors"][0]["team"]["abbreviation"]
+                away_team = competition["competitors"][1]["team"]["abbreviation"]
+                
+                broadcasts = competition.get("broadcasts", [])
+                broadcast_info = "TBD"
+                if broadcasts:
+                    broadcast_names = [b.get("names", [""])[0] for b in broadcasts]
+                    broadcast_info = ", ".join(filter(None, broadcast_names))
+
+                venue = competition.get("venue", {}).get("fullName", "TBD")
+                
+                game_info = (
+                    f"{self.get_team_display(away_team)} @ {self.get_team_display(home_team)}\n"
+                    f"{self.format_game_time(next_game_date)}\n"
+                    f"📺 {broadcast_info}\n"
+                    f"🏟️ {venue}"
+                )
+                
+                embed.add_field(
+                    name="Game Details",
+                    value=game_info,
+                    inline=False
+                )
+
+            else:
+                # Show full schedule (existing code)
+                embed = discord.Embed(
+                    title=f"🏀 Schedule for {team.title()}",
+                    color=discord.Color.blue()
+                )
+
+                for game_date, event in upcoming_games[:10]:
+                    competition = event["competitions"][0]
+                    home_team = competition["competitors"][0]["team"]["abbreviation"]
+                    away_team = competition["competitors"][1]["team"]["abbreviation"]
                     
-                    data = await resp.json()
-                    events = data.get("events", [])
-
-                    if not events:
-                        await interaction.followup.send("No games found for this team.")
-                        return
-
-                    current_time = datetime.now(timezone.utc)
-                    upcoming_games = []
-                    past_games = []
-
-                    for event in events:
-                        try:
-                            game_date = datetime.strptime(event["date"], "%Y-%m-%dT%H:%M%z")
-                            if game_date > current_time:
-                                upcoming_games.append((game_date, event))
-                            else:
-                                past_games.append((game_date, event))
-                        except (ValueError, KeyError):
-                            continue
-
-                    upcoming_games.sort(key=lambda x: x[0])
-                    past_games.sort(key=lambda x: x[0], reverse=True)
-
-                    if recent_game:
-                        if not upcoming_games:
-                            await interaction.followup.send("No upcoming games found for this team.")
-                            return
-
-                        # Show only the next upcoming game
-                        next_game_date, next_game_event = upcoming_games[0]
-                        embed = discord.Embed(
-                            title=f"🏀 Next Game for {team.title()}",
-                            color=discord.Color.blue()
-                        )
-
-                        competition = next_game_event["competitions"][0]
-                        home_team = competition["competitors"][0]["team"]["abbreviation"]
-                        away_team = competition["competitors"][1]["team"]["abbreviation"]
-                        
-                        broadcasts = competition.get("broadcasts", [])
-                        broadcast_info = "TBD"
-                        if broadcasts:
-                            broadcast_names = [b.get("names", [""])[0] for b in broadcasts]
-                            broadcast_info = ", ".join(filter(None, broadcast_names))
-
-                        venue = competition.get("venue", {}).get("fullName", "TBD")
-                        
-                        game_info = (
-                            f"{self.get_team_display(away_team)} @ {self.get_team_display(home_team)}\n"
-                            f"{self.format_game_time(next_game_date)}\n"
-                            f"📺 {broadcast_info}\n"
-                            f"🏟️ {venue}"
-                        )
-                        
-                        embed.add_field(
-                            name="Game Details",
-                            value=game_info,
-                            inline=False
-                        )
+                    broadcasts = competition.get("broadcasts", [])
+                    broadcast_info = "TBD"
+                    if broadcasts:
+                        broadcast_names = [b.get("names", [""])[0] for b in broadcasts]
+                        broadcast_info = ", ".join(filter(None, broadcast_names))
 
-                    else:
-                        # Show full schedule (existing code)
-                        embed = discord.Embed(
-                            title=f"🏀 Schedule for {team.title()}",
-                            color=discord.Color.blue()
-                        )
+                    venue = competition.get("venue", {}).get("fullName", "TBD")
+                    
+                    game_info = (
+                        f"{self.get_team_display(away_team)} @ {self.get_team_display(home_team)}\n"
+                        f"{self.format_game_time(game_date)}\n"
+                        f"📺 {broadcast_info}\n"
+                        f"🏟️ {venue}"
+                    )
+                    
+                    embed.add_field(
+                        name=f"Game {len(embed.fields) + 1}",
+                        value=game_info,
+                        inline=False
+                    )
 
-                        for game_date, event in upcoming_games[:10]:
-                            competition = event["competitions"][0]
-                            home_team = competition["competitors"][0]["team"]["abbreviation"]
-                            away_team = competition["competitors"][1]["team"]["abbreviation"]
-                            
-                            broadcasts = competition.get("broadcasts", [])
-                            broadcast_info = "TBD"
-                            if broadcasts:
-                                broadcast_names = [b.get("names", [""])[0] for b in broadcasts]
-                                broadcast_info = ", ".join(filter(None, broadcast_names))
-
-                            venue = competition.get("venue", {}).get("fullName", "TBD")
-                            
-                            game_info = (
-                                f"{self.get_team_display(away_team)} @ {self.get_team_display(home_team)}\n"
-                                f"{self.format_game_time(game_date)}\n"
-                                f"📺 {broadcast_info}\n"
-                                f"🏟️ {venue}"
-                            )
-                            
-                            embed.add_field(
-                                name=f"Game {len(embed.fields) + 1}",
-                                value=game_info,
-                                inline=False
-                            )
-
-                    await interaction.followup.send(embed=embed)
+            await interaction.followup.send(embed=embed)
 
         except Exception as e:
             await interaction.followup.send(f"An error occurred: {str(e)}")
@@ -6,15 +6,17 @@ import os
 from dotenv import load_dotenv
 import random
 import asyncio
-import io
-from pptx import Presentation
-import docx
-import PyPDF2
-import json
 import traceback
 import re
 import time
+from contextlib import aclosing
 from typing import Optional
+from utils.progress import ProgressReporter
+from utils.pipeline import Prefetcher
+from utils.extraction import ExtractionError
+from utils.chunking import ChunkedText
+from utils.document_cache import digest
+from utils.question_stream import QuestionStream
 # 
 
 class PresentationTriviaView(discord.ui.View):
@@ -26,12 +28,16 @@ class PresentationTriviaView(discord.ui.View):
         self.answer_event = asyncio.Event()
         self.last_reaction = None
         self.last_user = None
+        self.current_message_id = None
 
     @discord.ui.button(label="End Trivia", style=discord.ButtonStyle.danger)
     async def end_trivia(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id == self.interaction.user.id:
             self.active = False
             self.answer_event.set()
+            # Wake the pending answer wait instead of letting it run out the clock
+            if self.current_message_id is not None:
+                self.cog.bot.reactions.release(self.current_message_id)
             for item in self.children:
                 item.disabled = True
             await interaction.message.edit(view=self)
@@ -44,34 +50,36 @@ class PresentationTriviaView(discord.ui.View):
             await interaction.response.send_message("Only the person who started the trivia can end it.", ephemeral=True)
 
     async def wait_for_answer(self, bot, message, valid_reactions):
+        """Wait for the quiz owner's reaction; returns (emoji, user) or (None, None)"""
+        self.current_message_id = message.id
         try:
-            def check(reaction, user):
-                return (
-                    user.id == self.interaction.user.id 
-                    and str(reaction.emoji) in valid_reactions 
-                    and reaction.message.id == message.id
-                )
+            def check(emoji, user):
+                return user.id == self.interaction.user.id and emoji in valid_reactions
 
-            reaction, user = await bot.wait_for('reaction_add', timeout=30.0, check=check)
-            self.last_reaction = reaction
-            self.last_user = user
+            answer = await bot.reactions.wait_for(message.id, check=check, timeout=30.0)
             self.answer_event.set()
-            return reaction, user
+            if answer is None:  # Released because the quiz was ended
+                return None, None
+            self.last_reaction, self.last_user = answer
+            return answer
 
         except asyncio.TimeoutError:
             self.answer_event.set()
             return None, None
+        finally:
+            self.current_message_id = None
 
 class ContentChoiceView(discord.ui.View):
-    def __init__(self, cog, interaction):
+    def __init__(self, cog, interaction, bulk: bool = False):
         super().__init__(timeout=300)
         self.cog = cog
         self.interaction = interaction
+        self.bulk = bulk
 
     @discord.ui.button(label="Use Previous Content", style=discord.ButtonStyle.green, emoji="🔄")
     async def use_previous(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
-        content = self.cog.user_content.get(interaction.user.id)
+        content = await self.cog.get_user_content(interaction.user.id)
         if content:
             # Disable buttons after selection
             for item in self.children:
@@ -79,7 +87,7 @@ class ContentChoiceView(discord.ui.View):
             await interaction.message.edit(view=self)
             
             processing_msg = await interaction.followup.send("Generating quiz from previous content... 🎯")
-            await self.cog.start_quiz(interaction, content)
+            await self.cog.start_quiz(interaction, content, bulk=self.bulk)
         else:
             await interaction.followup.send("No previous content found. Please provide new content.")
 
@@ -106,30 +114,39 @@ class ContentChoiceView(discord.ui.View):
             
             if msg.attachments:
                 file = msg.attachments[0]
-                if not any(file.filename.endswith(ext) for ext in ['.txt', '.pdf', '.docx', '.pptx']):
+                if not self.cog.bot.extractor.supports(file.filename):
                     await interaction.followup.send(
                         "Invalid file type. Please use .txt, .pdf, .docx, or .pptx files."
                     )
                     return
                     
                 file_data = await file.read()
-                content = await self.cog.process_file(file_data, file.filename, interaction)
+                try:
+                    content = await self.cog.open_document(file_data, file.filename)
+                except ExtractionError as e:
+                    await interaction.followup.send(
+                        f"Error processing file: {str(e)}. Please try a different file or paste the content directly."
+                    )
+                    return
             else:
-                content = msg.content
+                content = ChunkedText.from_text(msg.content.strip(), self.cog.chunk_size, self.cog.MAX_CONTENT_SIZE)
 
-            if not content or len(content.strip()) < 50:
+            if len(content) < 50:
                 await interaction.followup.send(
                     "Not enough content provided. Please try again with more text."
                 )
                 return
             
             await processing_msg.edit(content="Content processed! Generating quiz... 🎯")
-            await self.cog.start_quiz(interaction, content)
+            await self.cog.start_quiz(interaction, content, bulk=self.bulk)
                 
         except asyncio.TimeoutError:
             await interaction.followup.send("No content received within 5 minutes. Please try again.")
 
 class PresentationTrivia(commands.Cog):
+    CONTENT_NAMESPACE = "quiz_documents"  # {user_id: document digest}; the text lives in the document cache
+    CONTENT_TTL = 30 * 24 * 3600  # Keep persisted content for 30 days
+
     def __init__(self, bot):
         self.bot = bot
         # Initialize Gemini
@@ -137,51 +154,82 @@ class PresentationTrivia(commands.Cog):
         genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
         self.model = genai.GenerativeModel('gemini-2.0-flash')
         
-        # Simplified cache structure
-        self.user_content = {}          # {user_id: str}  # Just store the content string
-        self.chunk_cache = {}           # Quiz-specific cache
-        self.used_questions = {}        # Quiz-specific cache
+        # Per-user state lives in the bot-wide session store (bounded, evicted when idle)
+        self.user_content = bot.sessions.namespace("quiz.content")       # {user_id: str}
+        self.chunk_cache = bot.sessions.namespace("quiz.chunks")         # Quiz-specific cache
+        self.used_questions = bot.sessions.namespace("quiz.used")        # Quiz-specific cache
         self.chunk_size = 4000          # Size of content chunk to process at a time
-        self.MAX_CONTENT_SIZE = 100000  # Maximum content size per user
+        self.MAX_CONTENT_SIZE = int(os.getenv('QUIZ_MAX_CONTENT_SIZE', 5000000))  # Characters kept per document
+        self.prefetch_depth = int(os.getenv('QUIZ_PREFETCH_DEPTH', 1))  # Chunks generated ahead of the player
+        self.bulk_workers = int(os.getenv('QUIZ_BULK_WORKERS', 4))      # Concurrent chunks per bulk quiz
+        self.bulk_depth = int(os.getenv('QUIZ_BULK_DEPTH', 16))         # Chunks generated ahead of the player in bulk mode
+        self.background_tasks = set()   # Extraction/registration tasks that outlive the command
+
+    async def cog_unload(self):
+        for task in list(self.background_tasks):
+            task.cancel()
+
+    async def get_user_content(self, user_id: int) -> Optional[str]:
+        """Return the user's last content, rehydrating it from the store after a restart"""
+        content = self.user_content.get(user_id)
+        if content is None:
+            document = await self.bot.store.get(self.CONTENT_NAMESPACE, user_id)
+            content = await self.bot.documents.get_text(document) if document else None
+            if content:
+                self.user_content[user_id] = content
+        return content
+
+    async def save_user_content(self, user_id: int, content: str) -> str:
+        """Remember the user's content in memory and persist its document digest; returns the digest"""
+        self.user_content[user_id] = content
+        document = await self.bot.documents.put_text(content)
+        await self.bot.store.set(self.CONTENT_NAMESPACE, user_id, document, ttl=self.CONTENT_TTL)
+        return document
         
-    async def generate_questions(self, content: str, start_pos: int = 0, user_id: int = None, interaction: discord.Interaction = None) -> list:
+    def _add_new_chunks(self, state: dict, content: ChunkedText):
+        """Queue chunks that arrived since the last call, skipping ones served from the document cache"""
+        new_chunks = [idx for idx in range(state['seen'], len(content.chunks)) if idx not in state['skip']]
+        state['seen'] = len(content.chunks)
+        if new_chunks:
+            state['chunks'].extend(new_chunks)
+            random.shuffle(state['chunks'])
+
+    async def generate_questions(self, content: ChunkedText, start_pos: int = 0, user_id: int = None, interaction: discord.Interaction = None, progress: ProgressReporter = None) -> list:
         """Generate questions using Gemini AI from a random unused chunk of content"""
         try:
-            if not content or len(content.strip()) < 50:
-                print("Content too short or empty")
+            state = self.chunk_cache.get(user_id)
+            used = self.used_questions.get(user_id)
+            if state is None or used is None:  # Quiz was ended (or evicted)
                 return []
 
-            # Calculate total chunks
-            total_chunks = (len(content) + self.chunk_size - 1) // self.chunk_size
-            
-            # Initialize or get the remaining chunks list for this user
-            if user_id not in self.chunk_cache:
-                # Create list of all chunk indices
-                self.chunk_cache[user_id] = {'chunks': list(range(total_chunks)), 'total_chunks': total_chunks, 'processed': {}, 'last_access': time.time()}
-                # Shuffle the list initially
-                random.shuffle(self.chunk_cache[user_id]['chunks'])
-            
+            # Documents stream in page by page; wait for a chunk if none is ready yet
+            while True:
+                complete = content.complete
+                self._add_new_chunks(state, content)
+                if state['chunks'] or complete:
+                    break
+                await content.wait_for_more()
+
             # If no chunks left, we're done
-            if not self.chunk_cache[user_id]['chunks']:
+            if not state['chunks']:
                 print("All chunks have been used")
                 return []
 
             # Pop the next chunk index from our shuffled list
-            chosen_chunk = self.chunk_cache[user_id]['chunks'].pop()
-            chunk_start = chosen_chunk * self.chunk_size
-            
-            # Extract the chunk
-            content_chunk = content[chunk_start:chunk_start + self.chunk_size]
+            chosen_chunk = state['chunks'].pop()
+            content_chunk = content.chunks[chosen_chunk]
+            total_chunks = f"{len(content.chunks)}" if content.complete else f"{len(content.chunks)}+"
             print(f"Processing chunk {chosen_chunk + 1}/{total_chunks}, length: {len(content_chunk)} characters")
 
-            # Send processing message
+            # Report processing state (coalesced into one throttled message)
             processing_embed = discord.Embed(
                 title="🤖 Processing Content",
                 description=f"Processing chunk {chosen_chunk + 1}/{total_chunks}...\n" +
-                           f"Chunks remaining: {len(self.chunk_cache[user_id]['chunks'])}/{total_chunks}",
+                           f"Chunks remaining: {len(state['chunks'])}/{total_chunks}",
                 color=discord.Color.blue()
             )
-            processing_msg = await interaction.followup.send(embed=processing_embed)
+            if progress is not None:
+                progress.update(embed=processing_embed)
 
             prompt = f"""You are a quiz generator. Generate multiple-choice questions about the key concepts from this content chunk.
 
@@ -216,11 +264,6 @@ CRITICAL RULES:
 Content chunk to use:
 {content_chunk}"""
 
-            print("Sending request to Gemini...")
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
-            
             def clean_text(text):
                 # Add space after punctuation
                 text = re.sub(r'([.!?,])([A-Za-z])', r'\1 \2', text)
@@ -233,64 +276,60 @@ Content chunk to use:
                 text = re.sub(r'(\w)"', r'\1 "', text)
                 return text.strip()
 
-            try:
-                json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if not json_match:
-                    return []
-                
-                parsed = json.loads(json_match.group())
-                if 'questions' not in parsed:
-                    return []
-                
-                metadata_keywords = ['instructor', 'professor', 'teacher', 'chapter', 
-                                   'section', 'page', 'course', 'code', 'syllabus']
+            metadata_keywords = ['instructor', 'professor', 'teacher', 'chapter', 
+                               'section', 'page', 'course', 'code', 'syllabus']
+
+            def accept(q):
+                """Validate and clean one question as soon as it has streamed in"""
+                # Identify the question by its text and answer
+                question_key = f"{q['question']}:{q['correct_answer']}"
                 
-                valid_questions = []
-                for q in parsed['questions']:
-                    # Create a unique hash for this question
-                    question_hash = hash(f"{q['question']}:{q['correct_answer']}")
+                # Skip if we've used this question before
+                if question_key in used:
+                    return None
+
+                if any(keyword in q['question'].lower() for keyword in metadata_keywords):
+                    return None
                     
-                    # Skip if we've used this question before
-                    if question_hash in self.used_questions[user_id]:
-                        continue
-
-                    if any(keyword in q['question'].lower() for keyword in metadata_keywords):
-                        continue
-                        
-                    if (isinstance(q, dict) and
-                        all(key in q for key in ['question', 'correct_answer', 'incorrect_answers', 'explanation']) and
-                        isinstance(q['incorrect_answers'], list) and 
-                        len(q['incorrect_answers']) == 3):
-                        
-                        # Clean and format all text fields
-                        cleaned_q = {
-                            'question': clean_text(q['question']),
-                            'correct_answer': clean_text(q['correct_answer']),
-                            'incorrect_answers': [clean_text(ans) for ans in q['incorrect_answers']],
-                            'explanation': clean_text(q['explanation'])
-                        }
-                        
-                        # Validate answer uniqueness and quality
-                        answers = [cleaned_q['correct_answer']] + cleaned_q['incorrect_answers']
-                        if (len(set(answers)) == 4 and  # All answers must be unique
-                            all(len(ans.strip()) > 0 for ans in answers)):  # No empty answers
-                            # Add question hash to used set
-                            self.used_questions[user_id].add(question_hash)
-                            valid_questions.append(cleaned_q)
-                
-                if valid_questions:
-                    random.shuffle(valid_questions)
-                    self.chunk_cache[user_id]['processed'][chosen_chunk] = valid_questions
-                    return valid_questions
-                
-            except Exception as e:
-                print(f"Error processing questions: {str(e)}")
-                return []
+                if (all(key in q for key in ['question', 'correct_answer', 'incorrect_answers', 'explanation']) and
+                    isinstance(q['incorrect_answers'], list) and 
+                    len(q['incorrect_answers']) == 3):
+                    
+                    # Clean and format all text fields
+                    cleaned_q = {
+                        'question': clean_text(q['question']),
+                        'correct_answer': clean_text(q['correct_answer']),
+                        'incorrect_answers': [clean_text(ans) for ans in q['incorrect_answers']],
+                        'explanation': clean_text(q['explanation'])
+                    }
+                    
+                    # Validate answer uniqueness and quality
+                    answers = [cleaned_q['correct_answer']] + cleaned_q['incorrect_answers']
+                    if (len(set(answers)) == 4 and  # All answers must be unique
+                        all(len(ans.strip()) > 0 for ans in answers)):  # No empty answers
+                        # Add question to used set
+                        used.add(question_key)
+                        return cleaned_q
+                return None
+
+            print("Streaming request to Gemini...")
+            stream = QuestionStream()
+            self._spawn(self._stream_batch(stream, prompt, user_id, accept, state, chosen_chunk))
+            # Hand the batch to the quiz as soon as its first question has been parsed
+            await stream.wait_for(1)
+            # An empty stream is falsy; its error tells a failed call apart from a chunk with nothing to ask
+            return stream
                 
         except Exception as e:
             print(f"Question generation error: {str(e)}")
             return []
 
+    def _chunks_left(self, user_id: int, content: ChunkedText) -> bool:
+        state = self.chunk_cache.get(user_id)
+        if state is None:  # Quiz was ended
+            return False
+        return bool(state['chunks']) or not content.complete or state['seen'] < len(content.chunks)
+
     def clean_content(self, content: str) -> str:
         """Clean and prepare content for question generation"""
         if not content:
@@ -308,82 +347,22 @@ Content chunk to use:
         
         return content
 
-    async def process_file(self, file_data: bytes, filename: str, interaction: discord.Interaction = None) -> str:
-        """Process different file types and extract text contents"""
-        try:
-            text_content = ""  # Initialize text_content variable
-            
-            if filename.endswith('.pptx'):
-                presentation = Presentation(io.BytesIO(file_data))
-                text_content = []
-                
-                for slide in presentation.slides:
-                    # Extract text from shapes
-                    for shape in slide.shapes:
-                        if hasattr(shape, "text") and shape.text.strip():
-                            text_content.append(shape.text.strip())
-                        
-                        # Handle tables specifically
-                        if shape.has_table:
-                            for row in shape.table.rows:
-                                for cell in row.cells:
-                                    if cell.text.strip():
-                                        text_content.append(cell.text.strip())
-                        
-                        # Handle text frames
-                        if hasattr(shape, "text_frame"):
-                            for paragraph in shape.text_frame.paragraphs:
-                                if paragraph.text.strip():
-                                    text_content.append(paragraph.text.strip())
-
-                return "\n".join(text_content)
-            
-            elif filename.endswith('.docx'):
-                doc = docx.Document(io.BytesIO(file_data))
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        text_content += paragraph.text.strip() + "\n"
-                    
-            elif filename.endswith('.pdf'):
-                pdf = PyPDF2.PdfReader(io.BytesIO(file_data))
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text.strip():
-                        text_content += text.strip() + "\n"
-                    
-            elif filename.endswith('.txt'):
-                text_content = file_data.decode('utf-8')
-            
-            # Clean and validate content
-            cleaned_content = self.clean_content(text_content)
-            if len(cleaned_content) < 50:  # Minimum content length check
-                print(f"Content too short after cleaning: {len(cleaned_content)} chars")
-                return ""
-                
-            print(f"Successfully processed {filename}, extracted {len(cleaned_content)} chars")
-            return cleaned_content
-            
-        except Exception as e:
-            print(f"Error processing file {filename}: {str(e)}")
-            if interaction:  # Only send message if interaction is provided
-                await interaction.followup.send(
-                    f"Error processing file: {str(e)}. Please try a different file or paste the content directly."
-                )
-            return ""
-
     @app_commands.command(name="quiz", description="Start a quiz game from presentation content")
-    @app_commands.describe(new_content="Start with new content? Default: Use previous content if available")
-    async def presentation_trivia(self, interaction: discord.Interaction, new_content: bool = False):
+    @app_commands.describe(
+        new_content="Start with new content? Default: Use previous content if available",
+        bulk="Generate questions for the whole document up front (faster for large uploads)"
+    )
+    async def presentation_trivia(self, interaction: discord.Interaction, new_content: bool = False, bulk: bool = False):
         # Defer the response immediately to prevent timeout
         await interaction.response.defer()
 
-        if not new_content and interaction.user.id in self.user_content:
+        if not new_content and await self.get_user_content(interaction.user.id):
             embed = discord.Embed(
                 title="📚 Presentation Quiz",
                 description="Would you like to use your previous content or provide new content?",
                 color=discord.Color.blue()
             )
-            view = ContentChoiceView(self, interaction)
+            view = ContentChoiceView(self, interaction, bulk=bulk)
             await interaction.followup.send(embed=embed, view=view)
             return
             
@@ -404,80 +383,177 @@ Content chunk to use:
             
             if msg.attachments:
                 file = msg.attachments[0]
-                if not any(file.filename.endswith(ext) for ext in ['.txt', '.pdf', '.docx', '.pptx']):
+                if not self.bot.extractor.supports(file.filename):
                     await interaction.followup.send(
                         "Invalid file type. Please use .txt, .pdf, .docx, or .pptx files."
                     )
                     return
                     
                 file_data = await file.read()
-                content = await self.process_file(file_data, file.filename, interaction)
+                try:
+                    content = await self.open_document(file_data, file.filename)
+                except ExtractionError as e:
+                    await interaction.followup.send(
+                        f"Error processing file: {str(e)}. Please try a different file or paste the content directly."
+                    )
+                    return
             else:
-                content = msg.content
+                content = ChunkedText.from_text(msg.content.strip(), self.chunk_size, self.MAX_CONTENT_SIZE)
 
-            if not content or len(content.strip()) < 50:
+            if len(content) < 50:
                 await interaction.followup.send(
                     "Not enough content provided. Please try again with more text."
                 )
                 return
             
             await processing_msg.edit(content="Content processed! Generating quiz... 🎯")
-            await self.start_quiz(interaction, content)
+            await self.start_quiz(interaction, content, bulk=bulk)
                 
         except asyncio.TimeoutError:
             await interaction.followup.send("No content received within 5 minutes. Please try again.")
 
+    async def _stream_batch(self, stream: QuestionStream, prompt: str, user_id: int, accept, state: dict, chunk: int):
+        """Fill ``stream`` from Gemini question by question, then remember the finished batch"""
+        await self.bot.question_batcher.generate(self.model, prompt, stream, accept, owner=user_id)
+        if not stream.questions:
+            return
+        state['processed'][chunk] = stream.questions
+        self.chunk_cache.touch(user_id)
+        # Until a streamed document finishes it has no digest; its batches are saved then
+        if state['document']:
+            try:
+                await self.bot.documents.put_batch(state['document'], str(chunk), stream.questions)
+            except Exception as e:
+                print(f"Failed to cache questions for chunk {chunk}: {e}")
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def open_document(self, file_data: bytes, filename: str) -> ChunkedText:
+        """Start streaming an upload into chunks; returns as soon as the first chunk is ready"""
+        file_digest = digest(file_data)
+        cached = await self.bot.documents.lookup_file(file_digest)
+        if cached is not None:
+            return ChunkedText.from_text(self.clean_content(cached), self.chunk_size, self.MAX_CONTENT_SIZE)
+
+        document = ChunkedText(self.chunk_size, self.MAX_CONTENT_SIZE)
+        self._spawn(self._stream_document(document, file_data, filename, file_digest))
+        await document.wait_for_chunks(1)
+        if document.error and not document.chunks:
+            raise document.error
+        return document
+
+    async def _stream_document(self, document: ChunkedText, file_data: bytes, filename: str, file_digest: str):
+        """Feed extracted pages into ``document`` and cache the text once it is complete"""
+        try:
+            # Closing the generator on break kills its worker and frees the stream slot right away
+            async with aclosing(self.bot.extractor.iter_pages(file_data, filename)) as pages:
+                async for page in pages:
+                    page = self.clean_content(page)
+                    if page and not document.feed(f" {page}" if len(document) else page):
+                        print(f"{filename} truncated at {self.MAX_CONTENT_SIZE:,} characters")
+                        break
+        except ExtractionError as e:
+            document.error = e
+            print(f"Extraction of {filename} stopped after {len(document):,} characters: {e}")
+        finally:
+            document.finish()
+
+        if len(document) and not document.error:
+            try:
+                await self.bot.documents.put_text(document.text, file_digest=file_digest)
+            except Exception as e:
+                print(f"Failed to cache extracted text for {filename}: {e}")
+        print(f"Successfully processed {filename}, extracted {len(document):,} chars")
+
     def clear_user_cache(self, user_id: int):
         """Clear quiz-specific cache for a user"""
         self.chunk_cache.pop(user_id, None)
         self.used_questions.pop(user_id, None)
         # Note: We don't clear user_content here to preserve it for future use
 
-    async def start_quiz(self, interaction: discord.Interaction, content: str):
-        """Start the quiz with the provided content"""
+    async def _register_document(self, user_id: int, content: ChunkedText, state: dict):
+        """Once a document is fully extracted, remember it and save the batches generated so far"""
+        await content.wait_complete()
+        text = content.text
+        state['document'] = await self.save_user_content(user_id, text)
+        for idx, batch in list(state['processed'].items()):
+            await self.bot.documents.put_batch(state['document'], str(idx), batch)
+
+    async def start_quiz(self, interaction: discord.Interaction, content, bulk: bool = False):
+        """Start the quiz with the provided content (text, or a document that is still streaming in)"""
         # Clear quiz-specific cache
         self.clear_user_cache(interaction.user.id)
         
-        # Check content size
-        if len(content) > self.MAX_CONTENT_SIZE:
-            await interaction.followup.send(
-                f"Content too large. Please provide content under {self.MAX_CONTENT_SIZE/1000}KB."
-            )
-            return
-            
-        # Store the content for future use
-        self.user_content[interaction.user.id] = content
-        
-        # Initialize quiz-specific tracking data
-        self.used_questions[interaction.user.id] = set()
+        if isinstance(content, str):
+            content = ChunkedText.from_text(content, self.chunk_size, self.MAX_CONTENT_SIZE)
         
+        # Initialize quiz-specific tracking data; each quiz starts with a fresh dedup scope
+        used = await self.bot.dedup.load(f"quiz:{interaction.user.id}")
+        used.clear()
+        self.used_questions[interaction.user.id] = used
+        state = {
+            'chunks': [], 'seen': 0, 'skip': set(), 'processed': {},
+            'last_access': time.time(), 'document': None
+        }
+        self.chunk_cache[interaction.user.id] = state
+
+        # Chunks anyone already generated questions for are served from the document cache
+        cached_batches = []
+        if content.complete:
+            await self._register_document(interaction.user.id, content, state)
+            cached = await self.bot.documents.get_batches(state['document'])
+            state['skip'] = {int(idx) for idx in cached}
+            cached_batches = [batch for batch in cached.values() if batch]
+            random.shuffle(cached_batches)
+        else:
+            self._spawn(self._register_document(interaction.user.id, content, state))
+
+        async def next_batch():
+            if cached_batches:
+                return QuestionStream.from_list(cached_batches.pop())
+            # Title and reference slides yield no questions; move on rather than ending the quiz early
+            while True:
+                questions = await self.generate_questions(content, 0, interaction.user.id, interaction, progress)
+                if questions or getattr(questions, 'error', None) or not self._chunks_left(interaction.user.id, content):
+                    return questions
+
+        progress = ProgressReporter(send=interaction.followup.send)
+        # Generate the next chunk's questions in the background while the current batch is answered.
+        # Bulk mode runs several chunks at once and further ahead; the bot-wide Gemini budget bounds the real concurrency.
+        batches = Prefetcher(
+            next_batch,
+            depth=max(self.bulk_depth, self.bulk_workers) if bulk else self.prefetch_depth,
+            workers=self.bulk_workers if bulk else 1
+        )
+        score = 0
+        current_question = 0
+        # Keep this game's state resident however many other sessions the store has to evict
+        self.chunk_cache.pin(interaction.user.id)
+        self.used_questions.pin(interaction.user.id)
         try:
             view = PresentationTriviaView(self, interaction)
-            score = 0
-            current_question = 0
-            content_position = 0
-            questions = []
+            questions = None
 
             # Initial progress message
-            progress = discord.Embed(
+            progress.update(embed=discord.Embed(
                 title="📚 Presentation Trivia",
                 description=f"Current Score: {score}/{current_question}\nGenerating questions...",
                 color=discord.Color.blue()
-            )
-            await interaction.followup.send(embed=progress)
+            ))
 
             while view.active:
-                if not questions:
+                # Take the next question, waiting for it if the model is still streaming the batch
+                question = await questions.pop() if questions else None
+                if question is None:
                     # Check if trivia was ended before generating new questions
                     if not view.active:
                         break
 
-                    questions = await self.generate_questions(
-                        content, 
-                        content_position,
-                        interaction.user.id,
-                        interaction
-                    )
+                    questions = await batches.next()
                     
                     if not questions:
                         # Add this condition to exit when no more questions can be generated
@@ -488,9 +564,7 @@ Content chunk to use:
                         )
                         await interaction.followup.send(embed=final_embed)
                         break
-
-                # Get current question
-                question = questions.pop(0)  # Take the next question
+                    question = await questions.pop()
                 
                 # Format question
                 question_embed = discord.Embed(
@@ -511,16 +585,19 @@ Content chunk to use:
 
                 msg = await interaction.followup.send(embed=question_embed, view=view)
 
-                # Add reactions
+                # Add reactions in the background; answers count as soon as the question is up
                 reactions = ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
-                for reaction in reactions:
-                    await msg.add_reaction(reaction)
+                seeding = self.bot.reactions.seed(msg, reactions)
 
                 # Check if trivia was ended before waiting for answer
                 if not view.active:
+                    seeding.cancel()
                     break
 
-                reaction, user = await view.wait_for_answer(self.bot, msg, reactions)
+                try:
+                    emoji, user = await view.wait_for_answer(self.bot, msg, reactions)
+                finally:
+                    seeding.cancel()
                 
                 if not view.active:  # If trivia was ended
                     final_embed = discord.Embed(
@@ -531,7 +608,7 @@ Content chunk to use:
                     await interaction.followup.send(embed=final_embed)
                     break
                     
-                if not reaction:  # If we timed out
+                if not emoji:  # If we timed out
                     timeout_embed = discord.Embed(
                         title="⏰ Time's Up!",
                         description=f"The correct answer was: **{question['correct_answer']}**\nFinal Score: {score}/{current_question}",
@@ -541,7 +618,7 @@ Content chunk to use:
                     break
 
                 # Process answer
-                selected_idx = reactions.index(str(reaction.emoji))
+                selected_idx = reactions.index(emoji)
                 selected_answer = all_answers[selected_idx]
                 is_correct = selected_answer == question['correct_answer']
 
@@ -569,19 +646,19 @@ Content chunk to use:
                 if view.active:
                     await asyncio.sleep(2)
 
-            # Show final score if we completed all questions
-            if view.active and current_question == len(questions):
-                final_embed = discord.Embed(
-                    title="🎉 Quiz Complete!",
-                    description=f"Congratulations! You've completed all questions!\nFinal Score: {score}/{current_question}\nPercentage: {(score/current_question)*100:.1f}%",
-                    color=discord.Color.gold()
-                )
-                await interaction.followup.send(embed=final_embed)
-
         except Exception as e:
             if view.active:  # Only show error if trivia wasn't manually ended
                 traceback.print_exc()
                 await interaction.followup.send(f"An error occurred: {str(e)}")
+        finally:
+            batches.close()
+            self.chunk_cache.unpin(interaction.user.id)
+            self.used_questions.unpin(interaction.user.id)
+            await progress.finish(embed=discord.Embed(
+                title="📚 Presentation Trivia",
+                description=f"Quiz finished after {current_question} question(s).\nFinal Score: {score}/{current_question}",
+                color=discord.Color.gold()
+            ))
 
     async def get_next_question(self, user_id: int) -> Optional[dict]:
         content = self.user_content.get(user_id)
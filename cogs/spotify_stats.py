@@ -1,20 +1,20 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
 import os
 from datetime import datetime
 import asyncio
+from utils.spotify import SpotifyClient
 
 class SpotifyStats(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         # Initialize Spotify client with client credentials flow (no user auth needed)
-        self.sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
+        self.sp = SpotifyClient(
+            bot.http_client,
             client_id=os.getenv('SPOTIFY_CLIENT_ID'),
             client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
-        ))
+        )
 
     @app_commands.command(name="artiststats", description="Look up Spotify stats for an artist")
     async def artist_stats(self, interaction: discord.Interaction, artist_name: str):
@@ -22,13 +22,11 @@ class SpotifyStats(commands.Cog):
         
         try:
             # Search for the artist
-            results = self.sp.search(q=artist_name, type='artist', limit=1)
+            artist = await self.sp.search_artist(artist_name)
             
-            if not results['artists']['items']:
+            if not artist:
                 await interaction.followup.send(f"Could not find artist: {artist_name}")
                 return
-                
-            artist = results['artists']['items'][0]
             
             # Create embed
             embed = discord.Embed(
@@ -56,11 +54,22 @@ class SpotifyStats(commands.Cog):
                 inline=True
             )
             
-            # Get top tracks (with error handling)
-            try:
-                top_tracks = self.sp.artist_top_tracks(artist['id'])
+            # Get top tracks and related artists concurrently (with error handling)
+            top_tracks, related = await asyncio.gather(
+                self.sp.artist_top_tracks(artist['id']),
+                self.sp.artist_related_artists(artist['id']),
+                return_exceptions=True
+            )
+
+            if isinstance(top_tracks, Exception):
+                embed.add_field(
+                    name="Top Tracks",
+                    value="Could not fetch top tracks",
+                    inline=False
+                )
+            else:
                 top_tracks_text = ""
-                for idx, track in enumerate(top_tracks['tracks'][:5], 1):
+                for idx, track in enumerate(top_tracks[:5], 1):
                     popularity = track['popularity']
                     top_tracks_text += f"{idx}. {track['name']} ({popularity}/100)\n"
                 
@@ -70,27 +79,18 @@ class SpotifyStats(commands.Cog):
                         value=top_tracks_text,
                         inline=False
                     )
-            except Exception as e:
+            
+            if isinstance(related, Exception):
                 embed.add_field(
-                    name="Top Tracks",
-                    value="Could not fetch top tracks",
+                    name="Similar Artists",
+                    value="Could not fetch related artists",
                     inline=False
                 )
-            
-            # Get related artists (with error handling)
-            try:
-                related = self.sp.artist_related_artists(artist['id'])
-                if related and related['artists']:
-                    related_text = ", ".join(artist['name'] for artist in related['artists'][:5])
-                    embed.add_field(
-                        name="Similar Artists",
-                        value=related_text,
-                        inline=False
-                    )
-            except Exception as e:
+            elif related:
+                related_text = ", ".join(related_artist['name'] for related_artist in related[:5])
                 embed.add_field(
                     name="Similar Artists",
-                    value="Could not fetch related artists",
+                    value=related_text,
                     inline=False
                 )
             
@@ -1,32 +1,291 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 import html
 import asyncio
 import random
+import time
+from collections import deque
+from typing import Optional
+
+class TriviaQuestionBuffer:
+    """Per-category prefetch buffer of OpenTDB questions.
+
+    Questions are pulled in bulk and refilled in the background whenever a
+    buffer drops below the low-water mark, so the next question normally comes
+    straight from memory. A bot-wide OpenTDB session token keeps games from
+    seeing repeats, and requests are spaced out to respect OpenTDB's per-IP
+    rate limit (one request every 5 seconds).
+    """
+
+    API_URL = "https://opentdb.com/api.php"
+    TOKEN_URL = "https://opentdb.com/api_token.php"
+
+    # OpenTDB response codes
+    SUCCESS = 0
+    NO_RESULTS = 1
+    TOKEN_NOT_FOUND = 3
+    TOKEN_EMPTY = 4
+    RATE_LIMITED = 5
+
+    def __init__(self, http_client, batch_size: int = 20, low_water: int = 5, min_request_interval: float = 5.0):
+        self.http_client = http_client
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.min_request_interval = min_request_interval
+        self._buffers: dict[Optional[str], deque] = {}
+        self._refills: dict[Optional[str], asyncio.Task] = {}
+        self._token: Optional[str] = None
+        self._request_lock = asyncio.Lock()
+        self._last_request = 0.0
+
+    async def get(self, category: str = None) -> Optional[dict]:
+        buffer = self._buffers.setdefault(category, deque())
+        if not buffer:
+            await asyncio.shield(self._schedule_refill(category))
+        question = buffer.popleft() if buffer else None
+        if len(buffer) < self.low_water:
+            self._schedule_refill(category)
+        return question
+
+    def prefetch(self, category: str = None):
+        """Start filling a category's buffer ahead of the first request"""
+        if not self._buffers.get(category):
+            self._schedule_refill(category)
+
+    def _schedule_refill(self, category: Optional[str]) -> asyncio.Task:
+        task = self._refills.get(category)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refill(category))
+            self._refills[category] = task
+        return task
+
+    async def _refill(self, category: Optional[str]):
+        try:
+            questions = await self._fetch_batch(category)
+            self._buffers.setdefault(category, deque()).extend(questions)
+        except Exception as e:
+            print(f"Failed to refill trivia buffer for category {category}: {e}")
+
+    async def _fetch_batch(self, category: Optional[str]) -> list:
+        amount = self.batch_size
+        for _ in range(4):
+            params = {"amount": amount, "type": "multiple"}
+            if category:
+                params["category"] = category
+            token = await self._get_token()
+            if token:
+                params["token"] = token
+
+            data = await self._request(self.API_URL, params)
+            if data is None:
+                return []
+            code = data.get("response_code")
+            if code == self.SUCCESS:
+                return data.get("results", [])
+            if code == self.NO_RESULTS and amount > 1:
+                # Fewer unseen questions left than requested
+                amount = max(1, amount // 2)
+            elif code == self.TOKEN_EMPTY:
+                await self._reset_token()
+            elif code == self.TOKEN_NOT_FOUND:
+                self._token = None
+            elif code != self.RATE_LIMITED:
+                return []
+        return []
+
+    async def _get_token(self) -> Optional[str]:
+        if self._token is None:
+            data = await self._request(self.TOKEN_URL, {"command": "request"})
+            if data and data.get("response_code") == self.SUCCESS:
+                self._token = data.get("token")
+        return self._token
+
+    async def _reset_token(self):
+        if self._token is None:
+            return
+        data = await self._request(self.TOKEN_URL, {"command": "reset", "token": self._token})
+        if not data or data.get("response_code") != self.SUCCESS:
+            self._token = None
+
+    async def _request(self, url: str, params: dict) -> Optional[dict]:
+        async with self._request_lock:
+            delay = self._last_request + self.min_request_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                status, data = await self.http_client.fetch_json("GET", url, params=params, coalesce=False)
+            finally:
+                self._last_request = time.monotonic()
+        return data if status == 200 else None
+
+    def cancel(self):
+        for task in self._refills.values():
+            task.cancel()
+        self._refills.clear()
 
 class TriviaView(discord.ui.View):
-    def __init__(self, cog, interaction, category):
+    def __init__(self, session):
         super().__init__(timeout=None)
-        self.cog = cog
-        self.original_interaction = interaction
-        self.category = category
-        self.active = True
-        self.current_timeout_task = None
+        self.session = session
 
     @discord.ui.button(label="End Game", style=discord.ButtonStyle.red)
     async def end_game(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user == self.original_interaction.user:
-            self.active = False
-            # Cancel current timeout task if it exists
-            if self.current_timeout_task and not self.current_timeout_task.done():
-                self.current_timeout_task.cancel()
+        if interaction.user == self.session.interaction.user:
+            self.session.end()
             await interaction.response.send_message("Trivia game ended! Thanks for playing! 🎮")
             self.stop()
         else:
             await interaction.response.send_message("Only the person who started the trivia can end the game!", ephemeral=True)
 
+class TriviaSession:
+    """One trivia game in one channel, run as an explicit state machine.
+
+    Rounds are driven by a loop instead of recursion, and everything that can
+    interrupt a round (an answer reaction, the End button, the answer timeout)
+    arrives as an event on a single queue. Nothing from a finished round is
+    kept alive, so memory per game stays constant however many rounds are played.
+    """
+
+    ASKING = "asking"
+    WAITING = "waiting"
+    REVEALING = "revealing"
+    ENDED = "ended"
+
+    ANSWER_TIMEOUT = 30.0
+    ROUND_DELAY = 3  # Brief pause between questions
+    REACTIONS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
+
+    def __init__(self, cog, interaction: discord.Interaction, category: str = None):
+        self.cog = cog
+        self.bot = cog.bot
+        self.interaction = interaction
+        self.category = category
+        self.channel_id = interaction.channel_id
+        self.state = self.ASKING
+        self.rounds = 0
+        self.events = asyncio.Queue()
+        self.view = TriviaView(self)
+
+    @property
+    def active(self) -> bool:
+        return self.state != self.ENDED
+
+    def end(self):
+        self.state = self.ENDED
+        self.events.put_nowait(("end", None))
+
+    def post_answer(self, message_id: int, emoji: str, user):
+        self.events.put_nowait(("answer", (message_id, emoji, user)))
+
+    async def run(self):
+        try:
+            while self.active:
+                self.state = self.ASKING
+                question_data = await self.cog.get_trivia_question(self.category)
+                if not self.active:
+                    break
+                if not question_data:
+                    await self.interaction.followup.send("Failed to fetch trivia question. Please try again.")
+                    break
+
+                # Decode HTML entities and prepare question
+                question = html.unescape(question_data['question'])
+                correct_answer = html.unescape(question_data['correct_answer'])
+                incorrect_answers = [html.unescape(ans) for ans in question_data['incorrect_answers']]
+                
+                all_answers = incorrect_answers + [correct_answer]
+                random.shuffle(all_answers)
+                
+                embed = discord.Embed(
+                    title="🎯 Trivia Time!",
+                    description=f"**Category:** {question_data['category']}\n**Difficulty:** {question_data['difficulty'].capitalize()}\n\n**Question:**\n{question}",
+                    color=discord.Color.blue()
+                )
+
+                for idx, answer in enumerate(all_answers, 1):
+                    embed.add_field(
+                        name=f"Option {idx}",
+                        value=answer,
+                        inline=False
+                    )
+
+                embed.set_footer(text="You have 30 seconds to answer! React with the number corresponding to your answer.")
+
+                message = await self.interaction.followup.send(embed=embed, view=self.view)
+                seeding = self.bot.reactions.seed(message, self.REACTIONS)
+
+                self.state = self.WAITING
+                try:
+                    event = await self.wait_for_event(message)
+                finally:
+                    seeding.cancel()
+                if event is None:
+                    timeout_embed = discord.Embed(
+                        title="⏰ Time's Up!",
+                        description=f"The correct answer was **{correct_answer}**\nGame ended due to timeout!",
+                        color=discord.Color.orange()
+                    )
+                    await self.interaction.followup.send(embed=timeout_embed)
+                    break
+
+                kind, payload = event
+                if kind == "end":
+                    break
+
+                self.state = self.REVEALING
+                _, emoji, user = payload
+                selected_answer = all_answers[self.REACTIONS.index(emoji)]
+                
+                result_embed = discord.Embed(
+                    title="🎯 Trivia Result",
+                    color=discord.Color.green() if selected_answer == correct_answer else discord.Color.red()
+                )
+                
+                if selected_answer == correct_answer:
+                    result_embed.description = f"✅ Correct, {user.mention}! The answer was **{correct_answer}**"
+                else:
+                    result_embed.description = f"❌ Sorry {user.mention}, that's incorrect. The correct answer was **{correct_answer}**"
+                
+                await self.interaction.followup.send(embed=result_embed)
+                self.rounds += 1
+
+                if self.active:
+                    await asyncio.sleep(self.ROUND_DELAY)
+        except asyncio.CancelledError:
+            # Game was cancelled (e.g. cog unloaded), nothing to report
+            pass
+        finally:
+            self.state = self.ENDED
+            self.view.stop()
+            self.cog.sessions.pop(self.channel_id, None)
+
+    async def wait_for_event(self, message: discord.Message):
+        """Wait for an answer to ``message`` or an end event; None on timeout"""
+        # Drop events left over from earlier rounds
+        while not self.events.empty():
+            self.events.get_nowait()
+        if not self.active:
+            return ("end", None)
+
+        def forward(emoji, user):
+            if emoji in self.REACTIONS:
+                self.post_answer(message.id, emoji, user)
+
+        self.bot.reactions.register(message.id, forward)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.ANSWER_TIMEOUT
+        try:
+            while True:
+                kind, payload = await asyncio.wait_for(self.events.get(), timeout=deadline - loop.time())
+                if kind == "answer" and payload[0] != message.id:
+                    continue
+                return kind, payload
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.bot.reactions.unregister(message.id)
+
 class Trivia(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -43,6 +302,17 @@ class Trivia(commands.Cog):
             'History': 23,
             'Animals': 27
         }
+        self.questions = TriviaQuestionBuffer(bot.http_client)
+        self.sessions = {}  # {channel_id: TriviaSession}
+
+    async def cog_load(self):
+        # Warm the "any category" buffer so the first game starts instantly
+        self.questions.prefetch()
+
+    async def cog_unload(self):
+        self.questions.cancel()
+        for session in list(self.sessions.values()):
+            session.end()
 
     async def category_autocomplete(
         self,
@@ -57,119 +327,21 @@ class Trivia(commands.Cog):
         ]
 
     async def get_trivia_question(self, category: str = None):
-        base_url = "https://opentdb.com/api.php?amount=1&type=multiple"
-        if category:
-            base_url += f"&category={category}"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(base_url) as response:
-                if response.status != 200:
-                    return None
-                data = await response.json()
-                return data['results'][0] if data['results'] else None
-
-    async def handle_trivia(self, interaction: discord.Interaction, category: str = None, view: TriviaView = None):
-        if not view:
-            view = TriviaView(self, interaction, category)
-
-        if not view.active:
-            return
-
-        question_data = await self.get_trivia_question(category)
-        if not question_data:
-            if interaction.response.is_done():
-                await interaction.followup.send("Failed to fetch trivia question. Please try again.")
-            else:
-                await interaction.response.send_message("Failed to fetch trivia question. Please try again.")
-            return
-
-        # Decode HTML entities and prepare question
-        question = html.unescape(question_data['question'])
-        correct_answer = html.unescape(question_data['correct_answer'])
-        incorrect_answers = [html.unescape(ans) for ans in question_data['incorrect_answers']]
-        
-        all_answers = incorrect_answers + [correct_answer]
-        random.shuffle(all_answers)
-        
-        embed = discord.Embed(
-            title="🎯 Trivia Time!",
-            description=f"**Category:** {question_data['category']}\n**Difficulty:** {question_data['difficulty'].capitalize()}\n\n**Question:**\n{question}",
-            color=discord.Color.blue()
-        )
-
-        for idx, answer in enumerate(all_answers, 1):
-            embed.add_field(
-                name=f"Option {idx}",
-                value=answer,
-                inline=False
-            )
-
-        embed.set_footer(text="You have 30 seconds to answer! React with the number corresponding to your answer.")
-
-        # Handle different interaction states
-        if interaction.response.is_done():
-            message = await interaction.followup.send(embed=embed, view=view)
-        else:
-            await interaction.response.send_message(embed=embed, view=view)
-            message = await interaction.original_response()
-
-        reactions = ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
-        for reaction in reactions:
-            await message.add_reaction(reaction)
-
-        def check(reaction, user):
-            return user != self.bot.user and str(reaction.emoji) in reactions and reaction.message.id == message.id
-
-        try:
-            # Create a timeout task that can be cancelled
-            view.current_timeout_task = asyncio.create_task(
-                self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            )
-            reaction, user = await view.current_timeout_task
-            
-            if not view.active:  # Check if game was ended while waiting
-                return
-                
-            selected_idx = reactions.index(str(reaction.emoji))
-            selected_answer = all_answers[selected_idx]
-            
-            result_embed = discord.Embed(
-                title="🎯 Trivia Result",
-                color=discord.Color.green() if selected_answer == correct_answer else discord.Color.red()
-            )
-            
-            if selected_answer == correct_answer:
-                result_embed.description = f"✅ Correct, {user.mention}! The answer was **{correct_answer}**"
-            else:
-                result_embed.description = f"❌ Sorry {user.mention}, that's incorrect. The correct answer was **{correct_answer}**"
-            
-            await interaction.followup.send(embed=result_embed)
-            
-            # Automatically ask next question if game is still active
-            if view.active:
-                await asyncio.sleep(3)  # Brief pause between questions
-                await self.handle_trivia(interaction, category, view)
-
-        except asyncio.TimeoutError:
-            if view.active:  # Only show timeout message if game wasn't ended
-                timeout_embed = discord.Embed(
-                    title="⏰ Time's Up!",
-                    description=f"The correct answer was **{correct_answer}**\nGame ended due to timeout!",
-                    color=discord.Color.orange()
-                )
-                await interaction.followup.send(embed=timeout_embed)
-                view.active = False
-                view.stop()
-        except asyncio.CancelledError:
-            # Question was cancelled (game ended), do nothing
-            pass
+        return await self.questions.get(category)
 
     @app_commands.command(name="trivia", description="Start a trivia game!")
     @app_commands.describe(category="Select a category (optional)")
     @app_commands.autocomplete(category=category_autocomplete)
     async def trivia(self, interaction: discord.Interaction, category: str = None):
         await interaction.response.defer()
-        await self.handle_trivia(interaction, category)
+
+        if interaction.channel_id in self.sessions:
+            await interaction.followup.send("A trivia game is already running in this channel! End it before starting a new one.")
+            return
+
+        session = TriviaSession(self, interaction, category)
+        self.sessions[interaction.channel_id] = session
+        await session.run()
 # 
 async def setup(bot):
     await bot.add_cog(Trivia(bot)) 
\ No newline at end of file
@@ -2,6 +2,15 @@ import os
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
+from utils.http_client import HTTPClient
+from utils.store import PersistentStore
+from utils.dispatch import ReactionDispatcher
+from utils.gemini import GeminiBudget
+from utils.batching import QuestionBatcher
+from utils.document_cache import DocumentCache
+from utils.extraction import DocumentExtractor
+from utils.dedup import QuestionDedup
+from utils.sessions import SessionStore
 
 # Load environment variables
 load_dotenv()
@@ -19,8 +28,51 @@ intents.presences = True  # For status and activity data
 intents.message_content = True  # For message content
 intents.guilds = True  # For server data
 
+class WebHeadBot(commands.Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Shared connection pool used by every cog for upstream API calls
+        self.http_client = HTTPClient.from_env()
+        # On-disk store so caches and catalogs survive restarts
+        self.store = PersistentStore(os.environ.get('BOT_DATA_PATH', 'data/webhead.db'))
+        # Routes reactions on game messages to the session waiting on them
+        self.reactions = ReactionDispatcher(self)
+        # Concurrency and requests-per-minute budget shared by every Gemini caller
+        self.gemini = GeminiBudget.from_env()
+        # Packs concurrent quiz generation requests into shared Gemini calls
+        self.question_batcher = QuestionBatcher.from_env(self.gemini)
+        # Extracted text and generated questions per document, shared across users
+        self.documents = DocumentCache.from_env(self.store)
+        # Parses uploaded PDF/DOCX/PPTX files in worker processes
+        self.extractor = DocumentExtractor.from_env()
+        # Questions each user has already been asked, persisted as Bloom filters
+        self.dedup = QuestionDedup.from_env(self.store)
+        # Per-user quiz state under one byte budget with LRU and idle-TTL eviction
+        self.sessions = SessionStore.from_env()
+
+    async def setup_hook(self):
+        await self.store.open()
+        await self.store.purge_expired()
+        await self.documents.open()
+        await self.dedup.open()
+        await self.http_client.start()
+        self.http_client.cache.attach_store(self.store)
+        self.reactions.attach()
+        self.sessions.start()
+
+    async def close(self):
+        await super().close()
+        await self.http_client.cache.flush()
+        await self.http_client.close()
+        self.extractor.close()
+        self.question_batcher.close()
+        self.gemini.close()
+        await self.dedup.close()
+        self.sessions.close()
+        await self.store.close()
+
 # Create a bot instance
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = WebHeadBot(command_prefix="!", intents=intents)
 
 async def load_extensions():
     extensions = [
@@ -38,7 +90,8 @@ async def load_extensions():
         "cogs.market",
         "cogs.presentation_trivia",
         "cogs.mc_quiz",
-        "cogs.spotify_stats"
+        "cogs.spotify_stats",
+        "cogs.diagnostics"
     ]
     for extension in extensions:
         try:
@@ -59,6 +112,7 @@ async def on_ready():
     except Exception as e:
         print(f"Failed to sync commands: {e}")
 
-# Run the bot
-bot.run(BOT_TOKEN)
+# Run the bot (extraction workers re-import this module, so only the main process starts it)
+if __name__ == "__main__":
+    bot.run(BOT_TOKEN)
 
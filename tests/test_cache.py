@@ -0,0 +1,87 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import CachePolicy, ResponseCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # Only the cache's clock moves; the event loop keeps the real one
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=clock, time=time.time))
+    return clock
+
+def make_cache(**kwargs):
+    return ResponseCache(policies={"p": CachePolicy(ttl=10, stale_ttl=20)}, **kwargs)
+
+def test_entries_expire_after_ttl_and_stale_window(clock):
+    cache = make_cache()
+    cache.set("k", "v", "p")
+    assert cache.get("k", "p") == (True, "v", False)
+    clock.now += 15
+    assert cache.get("k", "p", allow_stale=True) == (True, "v", True)
+    assert cache.get("k", "p") == (False, None, False)
+    cache.set("k", "v", "p")
+    clock.now += 31
+    assert cache.get("k", "p", allow_stale=True) == (False, None, False)
+
+def test_stale_hit_is_served_while_one_refresh_runs(clock):
+    async def scenario():
+        cache = make_cache()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return f"v{len(calls)}", 1
+
+        assert await cache.get_or_fetch("k", "p", fetch) == "v1"
+        clock.now += 15
+        stale = await asyncio.gather(*(cache.get_or_fetch("k", "p", fetch) for _ in range(3)))
+        assert stale == ["v1"] * 3
+        await asyncio.sleep(0.01)
+        assert len(calls) == 2
+        assert await cache.get_or_fetch("k", "p", fetch) == "v2"
+        counters = cache.stats()["policies"]["p"]
+        assert (counters["hits"], counters["stale_hits"], counters["misses"], counters["refreshes"]) == (1, 3, 1, 1)
+
+    asyncio.run(scenario())
+
+def test_uncacheable_results_are_not_stored(clock):
+    async def scenario():
+        cache = make_cache()
+
+        async def fetch():
+            return "error", 1
+
+        await cache.get_or_fetch("k", "p", fetch, cacheable=lambda value: value != "error")
+        return cache.get("k", "p")
+
+    assert asyncio.run(scenario()) == (False, None, False)
+
+def test_lru_eviction_by_count_and_bytes(clock):
+    cache = make_cache(max_entries=2, max_bytes=100)
+    cache.set("a", 1, "p")
+    cache.set("b", 2, "p")
+    cache.get("a", "p")
+    cache.set("c", 3, "p")
+    assert [cache.get(k, "p")[0] for k in "abc"] == [True, False, True]
+    # 1 + 1 + 99 bytes is over budget: the least recently used entry goes
+    cache.set("big", 4, "p", size=99)
+    assert cache.stats()["bytes"] == 100
+    assert [cache.get(k, "p")[0] for k in ("a", "c", "big")] == [False, True, True]
+    assert cache.stats()["evictions"] == 2
+
+def test_unknown_policy_is_rejected(clock):
+    with pytest.raises(KeyError):
+        make_cache().set("k", "v", "missing")
@@ -0,0 +1,67 @@
+import asyncio
+
+from utils.dedup import BloomFilter, QuestionDedup, question_digest
+from utils.store import PersistentStore
+
+def test_digest_ignores_case_and_spacing():
+    assert question_digest("What  is\nPython?") == question_digest("what is python?")
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(question_digest(f"question {i}"))
+    assert all(question_digest(f"question {i}") in bloom for i in range(1000))
+    false_positives = sum(question_digest(f"other {i}") in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.03
+
+def _with_dedup(tmp_path, scenario, **kwargs):
+    async def run():
+        store = PersistentStore(str(tmp_path / "test.db"))
+        await store.open()
+        dedup = QuestionDedup(store, flush_interval=3600, **kwargs)
+        await dedup.open()
+        try:
+            return await scenario(store, dedup)
+        finally:
+            await dedup.close()
+            await store.close()
+    return asyncio.run(run())
+
+def test_generations_keep_recent_questions(tmp_path):
+    async def scenario(store, dedup):
+        seen = await dedup.load("scope")
+        for i in range(25):
+            seen.add(f"q{i}")
+        # Capacity 10: the last two generations cover q10..q24
+        assert all(f"q{i}" in seen for i in range(10, 25))
+        assert len(seen) == 25
+
+    _with_dedup(tmp_path, scenario, capacity=10)
+
+def test_scopes_survive_a_restart(tmp_path):
+    async def write(store, dedup):
+        (await dedup.load("scope")).add("remembered")
+
+    async def read(store, dedup):
+        seen = await dedup.load("scope")
+        return "remembered" in seen, "forgotten" in seen
+
+    _with_dedup(tmp_path, write)
+    assert _with_dedup(tmp_path, read) == (True, False)
+
+def test_scope_evicted_while_held_keeps_later_additions(tmp_path):
+    async def scenario(store, dedup):
+        held = await dedup.load("held")
+        await dedup.load("a")
+        await dedup.load("b")
+        held.add("late")
+        assert await dedup.load("held") is held
+        await dedup.flush()
+        return held
+
+    _with_dedup(tmp_path, scenario, max_scopes=1)
+
+    async def read(store, dedup):
+        return "late" in await dedup.load("held")
+
+    assert _with_dedup(tmp_path, read)
@@ -0,0 +1,44 @@
+import random
+from datetime import datetime, timedelta
+
+from utils.guild_index import FenwickTree, GuildMemberIndex
+
+def test_fenwick_matches_brute_force():
+    rng = random.Random(5)
+    values = [rng.randint(0, 1) for _ in range(50)]
+    tree = FenwickTree(values)
+    for _ in range(200):
+        action = rng.random()
+        if action < 0.3:
+            value = rng.randint(0, 1)
+            values.append(value)
+            tree.append(value)
+        elif action < 0.6:
+            index = rng.randrange(len(values))
+            delta = -values[index] if values[index] else 1
+            values[index] += delta
+            tree.add(index, delta)
+        index = rng.randrange(len(values))
+        assert tree.prefix_sum(index) == sum(values[:index + 1])
+    assert len(tree) == len(values)
+
+def test_append_to_empty_tree():
+    tree = FenwickTree()
+    for _ in range(9):
+        tree.append(1)
+    assert [tree.prefix_sum(i) for i in range(9)] == list(range(1, 10))
+
+def test_join_positions_follow_join_order():
+    start = datetime(2024, 1, 1)
+    index = GuildMemberIndex([
+        (3, start + timedelta(days=2), False, False),
+        (1, start, False, True),
+        (2, start + timedelta(days=1), True, False),
+    ])
+    assert [index.join_position(m) for m in (1, 2, 3)] == [1, 2, 3]
+    index.remove_member(2)
+    index.add_member(4, is_bot=False)
+    assert [index.join_position(m) for m in (1, 3, 4)] == [1, 2, 3]
+    assert index.member_count == 3
+    assert index.bot_count == 0
+    assert index.online_count == 1
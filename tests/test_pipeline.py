@@ -0,0 +1,73 @@
+import asyncio
+
+from utils.pipeline import Prefetcher
+
+def test_prefetch_stays_within_depth():
+    async def scenario():
+        produced = []
+
+        async def produce():
+            produced.append(len(produced))
+            return [len(produced)]
+
+        batches = Prefetcher(produce, depth=2)
+        first = await batches.next()
+        await asyncio.sleep(0.01)
+        # One consumed, plus at most `depth` produced ahead
+        assert first == [1]
+        assert len(produced) == 3
+        batches.close()
+
+    asyncio.run(scenario())
+
+def test_falsy_batch_exhausts_the_source():
+    async def scenario():
+        remaining = [[1], [2]]
+
+        async def produce():
+            return remaining.pop(0) if remaining else []
+
+        batches = Prefetcher(produce, depth=1)
+        assert await batches.next() == [1]
+        assert await batches.next() == [2]
+        assert await batches.next() is None
+        assert await batches.next() is None
+
+    asyncio.run(scenario())
+
+def test_producer_errors_end_the_stream_instead_of_raising():
+    async def scenario():
+        async def produce():
+            raise RuntimeError("boom")
+
+        batches = Prefetcher(produce)
+        assert await batches.next() is None
+
+    asyncio.run(scenario())
+
+def test_workers_run_concurrently():
+    async def scenario():
+        running = 0
+        peak = 0
+        left = 6
+
+        async def produce():
+            nonlocal running, peak, left
+            if left <= 0:
+                return None
+            left -= 1
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [left]
+
+        batches = Prefetcher(produce, depth=3, workers=3)
+        results = []
+        while (batch := await batches.next()) is not None:
+            results.append(batch)
+        return peak, len(results)
+
+    peak, count = asyncio.run(scenario())
+    assert peak == 3
+    assert count == 6
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from utils.question_stream import QuestionParser, QuestionStream, parse_questions
+
+QUESTIONS = [
+    {"question": "What does {x} mean?", "correct_answer": "A \"quoted\" brace }", "incorrect_answers": ["b", "c", "d"]},
+    {"question": "Second?", "correct_answer": "yes", "incorrect_answers": ["no", "maybe", "never"]},
+]
+RESPONSE = "```json\n" + json.dumps({"questions": QUESTIONS}, indent=2) + "\n```"
+
+def test_parser_yields_questions_as_they_complete():
+    parser = QuestionParser()
+    found = []
+    for i in range(0, len(RESPONSE), 7):
+        found.extend(parser.feed(RESPONSE[i:i + 7]))
+    assert found == QUESTIONS
+    assert parser.done
+
+def test_parser_waits_for_the_questions_array():
+    parser = QuestionParser()
+    assert parser.feed('{"questions"') == []
+    assert parser.feed(': [{"question": "q"}') == [{"question": "q"}]
+    assert not parser.done
+    assert parser.feed("]}") == []
+    assert parser.done
+
+def test_parser_skips_malformed_objects():
+    parser = QuestionParser()
+    assert parser.feed('{"questions": [{"question": q}, {"question": "ok"}]}') == [{"question": "ok"}]
+
+def test_whole_body_fallback():
+    assert parse_questions("Sure! " + json.dumps({"questions": QUESTIONS})) == QUESTIONS
+    assert parse_questions("no json here") == []
+
+def test_stream_pop_waits_for_producer():
+    async def scenario():
+        stream = QuestionStream()
+        popped = asyncio.create_task(stream.pop())
+        await asyncio.sleep(0)
+        assert not popped.done()
+        stream.add(QUESTIONS[0])
+        assert await popped == QUESTIONS[0]
+        stream.finish()
+        assert await stream.pop() is None
+
+    asyncio.run(scenario())
+
+def test_followers_each_see_every_question():
+    async def scenario():
+        stream = QuestionStream()
+
+        async def collect():
+            return [q async for q in stream.follow()]
+
+        followers = [asyncio.create_task(collect()) for _ in range(2)]
+        for question in QUESTIONS:
+            stream.add(question)
+            await asyncio.sleep(0)
+        stream.finish()
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(scenario()) == [QUESTIONS, QUESTIONS]
+
+def test_empty_stream_is_falsy_but_complete_list_is_not():
+    assert not QuestionStream()
+    assert QuestionStream.from_list(QUESTIONS)
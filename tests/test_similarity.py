@@ -0,0 +1,56 @@
+import random
+
+from utils.similarity import MinHashLSH, NearDuplicateFilter
+
+def _questions(count, seed=7):
+    """Questions on one topic: each shares a few words from a small topic vocabulary, like a real bank"""
+    rng = random.Random(seed)
+    topic = [f"topic{i}" for i in range(10)]
+    vocab = [f"term{i}" for i in range(3000)]
+    return [" ".join(rng.sample(topic, 4) + rng.sample(vocab, 5)) for _ in range(count)]
+
+def _reword(text, rng):
+    words = text.split()
+    words[rng.randrange(len(words))] = f"other{rng.randrange(10 ** 6)}"
+    return " ".join(words)
+
+def test_lookup_touches_few_candidates():
+    index = MinHashLSH(max_items=5000)
+    questions = _questions(1350)
+    for question in questions:
+        index.add(question)
+    probes = _questions(200, seed=8)
+    average = sum(len(index.candidates(index.signature(p))) for p in probes) / len(probes)
+    assert average < len(questions) * 0.1
+
+def test_reworded_questions_are_found():
+    index = MinHashLSH(max_items=5000)
+    questions = _questions(1350)
+    for question in questions:
+        index.add(question)
+    rng = random.Random(3)
+    probes = rng.sample(questions, 200)
+    recall = sum(index.find(_reword(p, rng)) >= index.threshold for p in probes) / len(probes)
+    assert recall >= 0.95
+
+def test_unrelated_question_is_new():
+    index = MinHashLSH()
+    assert index.add_if_new("What is the capital city of France?")
+    assert not index.add_if_new("Name the capital city of France.")
+    assert index.add_if_new("Which planet is closest to the sun?")
+
+def test_oldest_items_are_forgotten():
+    index = MinHashLSH(max_items=2)
+    for question in _questions(3):
+        index.add(question)
+    assert len(index) == 2
+    assert index.find(_questions(3)[0]) < index.threshold
+
+def test_filter_tracks_duplicate_rate_and_scopes():
+    dedup = NearDuplicateFilter(max_scopes=1)
+    batch = [{'question': q} for q in _questions(4)]
+    assert dedup.filter("a", batch) == batch
+    assert dedup.filter("a", batch) == []
+    assert dedup.duplicate_rate("a") == 0.5
+    dedup.seed("b", [])
+    assert "a" not in dedup and "b" in dedup
@@ -0,0 +1,142 @@
+import asyncio
+import os
+from typing import Callable, Hashable, Optional
+
+from utils.question_stream import QuestionParser, QuestionStream, fill_questions, offer, parse_questions
+
+BATCH_PROMPT = """You are completing {count} independent quiz-generation tasks in a single response.
+Each task is delimited by "=== TASK <id> ===" and "=== END TASK <id> ===". Follow each task's own
+instructions and rules, and use only that task's own topic or content for its questions.
+
+Respond with ONE JSON object of the form {{"questions": [...]}} holding the questions of every task.
+Every question object must have a "task" field set to the id of the task it belongs to, in addition
+to the fields that task asks for. Do not mix material between tasks.
+
+{tasks}"""
+
+class QuestionBatcher:
+    """Pack question-generation requests from different users into shared Gemini calls.
+
+    Requests for the same model that arrive within ``window`` seconds of each
+    other are sent as one multi-task prompt (at most ``max_sections`` tasks).
+    Every generated question is tagged with its task id, so the streamed
+    response is routed back to each caller's QuestionStream as it arrives.
+    Under a requests-per-minute quota this turns N calls into one.
+    """
+
+    def __init__(self, budget, window: float = 0.5, max_sections: int = 4):
+        self.budget = budget
+        self.window = window
+        self.max_sections = max(1, max_sections)
+        self.requests = 0
+        self.calls = 0
+        self.retries = 0
+        self._pending: dict[Hashable, list] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks = set()
+
+    @classmethod
+    def from_env(cls, budget):
+        return cls(
+            budget,
+            window=float(os.getenv('GEMINI_BATCH_WINDOW', 0.5)),
+            max_sections=int(os.getenv('GEMINI_BATCH_MAX_SECTIONS', 4))
+        )
+
+    async def generate(self, model, prompt: str, stream: QuestionStream,
+                       accept: Callable[[dict], Optional[dict]], owner: Hashable = None) -> list:
+        """Fill ``stream`` with the questions Gemini generates for ``prompt``; returns them once complete"""
+        self.requests += 1
+        if self.window <= 0 or self.max_sections == 1:
+            self.calls += 1
+            await fill_questions(stream, self.budget.stream(model, prompt, owner=owner), accept)
+            return stream.questions
+
+        key = getattr(model, 'model_name', id(model))
+        group = self._pending.setdefault(key, [])
+        group.append({'prompt': prompt, 'stream': stream, 'accept': accept, 'owner': owner})
+        if len(group) >= self.max_sections:
+            self._dispatch(key, model)
+        elif len(group) == 1:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.window, self._dispatch, key, model)
+        return await stream.wait_complete()
+
+    def _dispatch(self, key: Hashable, model):
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        group = self._pending.pop(key, None)
+        if group:
+            task = asyncio.create_task(self._run(model, group))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _solo(self, model, request: dict):
+        self.calls += 1
+        await fill_questions(
+            request['stream'], self.budget.stream(model, request['prompt'], owner=request['owner']), request['accept']
+        )
+
+    async def _run(self, model, group: list):
+        if len(group) == 1:
+            await self._solo(model, group[0])
+            return
+
+        sections = {f"t{i + 1}": request for i, request in enumerate(group)}
+        prompt = BATCH_PROMPT.format(count=len(sections), tasks="\n\n".join(
+            f"=== TASK {task_id} ===\n{request['prompt']}\n=== END TASK {task_id} ==="
+            for task_id, request in sections.items()
+        ))
+
+        def route(raw):
+            request = sections.get(str(raw.pop('task', ''))) if isinstance(raw, dict) else None
+            if request is not None:
+                offer(request['stream'], request['accept'], raw)
+
+        self.calls += 1
+        parser = QuestionParser()
+        text = []
+        error = None
+        try:
+            async for piece in self.budget.stream(model, prompt, owner=group[0]['owner']):
+                text.append(piece)
+                for raw in parser.feed(piece):
+                    route(raw)
+            if not parser.done and not any(request['stream'].questions for request in group):
+                for raw in parse_questions("".join(text)):
+                    route(raw)
+        except asyncio.CancelledError:
+            for request in group:
+                request['stream'].finish()
+            raise
+        except Exception as e:
+            print(f"Error in batched Gemini call ({len(group)} tasks): {e}")
+            error = e
+
+        # Tasks the model skipped get a call of their own rather than coming back empty
+        skipped = [request for request in group if not request['stream'].questions and error is None]
+        for request in group:
+            if request not in skipped:
+                request['stream'].finish(error)
+        if skipped:
+            self.retries += len(skipped)
+            await asyncio.gather(*(self._solo(model, request) for request in skipped))
+
+    def close(self):
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for group in self._pending.values():
+            for request in group:
+                request['stream'].finish()
+        self._pending.clear()
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "calls": self.calls,
+            "retries": self.retries,
+            "pending": sum(len(group) for group in self._pending.values())
+        }
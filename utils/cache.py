@@ -0,0 +1,214 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float              # Seconds an entry is served as fresh
+    stale_ttl: float = 0.0  # Extra seconds an expired entry may be served while it is refreshed
+
+# Per-endpoint TTLs, tuned to how often each upstream actually changes
+DEFAULT_POLICIES = {
+    "espn_scoreboard": CachePolicy(ttl=60, stale_ttl=300),
+    "espn_team_schedule": CachePolicy(ttl=300, stale_ttl=1800),
+    "horoscope": CachePolicy(ttl=1800, stale_ttl=1800),
+    "urban": CachePolicy(ttl=3600, stale_ttl=24 * 3600),
+    "leetcode_profile": CachePolicy(ttl=300, stale_ttl=900),
+    "leetcode_problemset": CachePolicy(ttl=3600, stale_ttl=24 * 3600),
+    "leetcode_content": CachePolicy(ttl=24 * 3600, stale_ttl=7 * 24 * 3600),
+    "market": CachePolicy(ttl=60, stale_ttl=120),
+    "spotify": CachePolicy(ttl=900, stale_ttl=3600),
+}
+
+class _Entry:
+    __slots__ = ("value", "size", "policy", "stored_at")
+
+    def __init__(self, value, size: int, policy: str, stored_at: float):
+        self.value = value
+        self.size = size
+        self.policy = policy
+        self.stored_at = stored_at
+
+class ResponseCache:
+    """Async in-memory cache with per-policy TTLs, LRU eviction and stale-while-revalidate.
+
+    Entries are bounded both by count and by an approximate byte size. When an
+    entry is past its TTL but still inside its stale window, the old value is
+    returned immediately and a single background refresh is scheduled.
+
+    With a persistent store attached, new entries are written through to disk
+    and memory misses fall back to the store, so a restart starts warm.
+    """
+
+    NAMESPACE = "response_cache"
+
+    def __init__(self, policies: dict = None, max_entries: int = 2048, max_bytes: int = 32 * 1024 * 1024):
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Any, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: dict = {}
+        self._counters = defaultdict(lambda: {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0})
+        self.evictions = 0
+        self.store = None
+        self._pending_writes = set()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(
+            max_entries=int(os.getenv('CACHE_MAX_ENTRIES', 2048)),
+            max_bytes=int(os.getenv('CACHE_MAX_BYTES', 32 * 1024 * 1024))
+        )
+
+    def _policy(self, name: str) -> CachePolicy:
+        if name not in self.policies:
+            raise KeyError(f"Unknown cache policy: {name}")
+        return self.policies[name]
+
+    def get(self, key, policy: str, allow_stale: bool = False):
+        """Return ``(found, value, is_stale)`` for a key without fetching"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None, False
+        age = time.monotonic() - entry.stored_at
+        rules = self._policy(policy)
+        if age <= rules.ttl:
+            self._entries.move_to_end(key)
+            return True, entry.value, False
+        if allow_stale and age <= rules.ttl + rules.stale_ttl:
+            self._entries.move_to_end(key)
+            return True, entry.value, True
+        self._remove(key)
+        return False, None, False
+
+    def set(self, key, value, policy: str, size: int = 1):
+        self._insert(key, value, policy, size, time.monotonic())
+        if self.store is not None:
+            rules = self._policy(policy)
+            task = asyncio.create_task(self._persist(key, value, size, rules.ttl + rules.stale_ttl))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+
+    def _insert(self, key, value, policy: str, size: int, stored_at: float):
+        self._policy(policy)
+        self._remove(key)
+        self._entries[key] = _Entry(value, size, policy, stored_at)
+        self._bytes += size
+        self._evict()
+
+    def attach_store(self, store):
+        """Write entries through to ``store`` and rehydrate from it on misses"""
+        self.store = store
+
+    @staticmethod
+    def _store_key(key) -> str:
+        return json.dumps(key, default=str)
+
+    async def _persist(self, key, value, size: int, ttl: float):
+        try:
+            await self.store.set(self.NAMESPACE, self._store_key(key), {"value": value, "size": size}, ttl=ttl)
+        except Exception as e:
+            print(f"Failed to persist cache entry: {e}")
+
+    async def _load_persisted(self, key, policy: str) -> bool:
+        if self.store is None:
+            return False
+        try:
+            record, updated_at = await self.store.get(self.NAMESPACE, self._store_key(key), with_timestamp=True)
+        except Exception as e:
+            print(f"Failed to read persisted cache entry: {e}")
+            return False
+        if record is None:
+            return False
+        age = time.time() - updated_at
+        rules = self._policy(policy)
+        if age > rules.ttl + rules.stale_ttl:
+            return False
+        self._insert(key, record["value"], policy, record.get("size", 1), time.monotonic() - age)
+        return True
+
+    def invalidate(self, key):
+        self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    async def flush(self):
+        """Wait for pending write-throughs to reach the store"""
+        if self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes), return_exceptions=True)
+
+    def cancel_refreshes(self):
+        """Cancel any background refreshes still in flight (used on shutdown)"""
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+
+    async def get_or_fetch(self, key, policy: str, fetch: Callable[[], Awaitable[tuple]],
+                           cacheable: Optional[Callable[[Any], bool]] = None):
+        """Serve ``key`` from cache or call ``fetch``.
+
+        ``fetch`` must return a ``(value, size)`` tuple. Values rejected by
+        ``cacheable`` are returned to the caller but never stored.
+        """
+        counters = self._counters[policy]
+        found, value, stale = self.get(key, policy, allow_stale=True)
+        if not found and await self._load_persisted(key, policy):
+            found, value, stale = self.get(key, policy, allow_stale=True)
+        if found and not stale:
+            counters["hits"] += 1
+            return value
+        if found:
+            counters["stale_hits"] += 1
+            if key not in self._refreshing:
+                task = asyncio.create_task(self._refresh(key, policy, fetch, cacheable))
+                self._refreshing[key] = task
+            return value
+
+        counters["misses"] += 1
+        value, size = await fetch()
+        if cacheable is None or cacheable(value):
+            self.set(key, value, policy, size)
+        return value
+
+    async def _refresh(self, key, policy: str, fetch, cacheable):
+        try:
+            value, size = await fetch()
+            if cacheable is None or cacheable(value):
+                self.set(key, value, policy, size)
+            self._counters[policy]["refreshes"] += 1
+        except Exception as e:
+            print(f"Background refresh failed for {policy}: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters per policy plus overall residency"""
+        policies = {}
+        for name, counters in self._counters.items():
+            lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+            served = counters["hits"] + counters["stale_hits"]
+            policies[name] = dict(counters, hit_rate=(served / lookups) if lookups else 0.0)
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "evictions": self.evictions,
+            "policies": policies
+        }
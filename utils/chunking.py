@@ -0,0 +1,81 @@
+import asyncio
+from typing import Optional
+
+class ChunkedText:
+    """Document text split into fixed-size chunks as it arrives.
+
+    Extraction appends pages with ``feed()`` while consumers already work on
+    the chunks completed so far; ``wait_for_more()`` wakes them when new
+    chunks land or the document is finished. Input beyond ``max_chars`` is
+    dropped (``truncated`` is set) so one huge upload has a hard memory bound.
+    """
+
+    def __init__(self, chunk_size: int = 4000, max_chars: int = None):
+        self.chunk_size = chunk_size
+        self.max_chars = max_chars
+        self.chunks: list[str] = []
+        self.length = 0
+        self.complete = False
+        self.truncated = False
+        self.error: Optional[Exception] = None
+        self._tail = ""
+        self._changed = asyncio.Event()
+
+    @classmethod
+    def from_text(cls, text: str, chunk_size: int = 4000, max_chars: int = None) -> "ChunkedText":
+        document = cls(chunk_size, max_chars)
+        document.feed(text)
+        document.finish()
+        return document
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks) + self._tail
+
+    def feed(self, text: str) -> bool:
+        """Append text; returns False once the document is full or finished"""
+        if self.complete or self.truncated:
+            return False
+        if self.max_chars is not None and self.length + len(text) > self.max_chars:
+            text = text[:self.max_chars - self.length]
+            self.truncated = True
+        self.length += len(text)
+        data = self._tail + text
+        added = False
+        while len(data) >= self.chunk_size:
+            self.chunks.append(data[:self.chunk_size])
+            data = data[self.chunk_size:]
+            added = True
+        self._tail = data
+        if added:
+            self._notify()
+        return not self.truncated
+
+    def finish(self):
+        if self.complete:
+            return
+        if self._tail:
+            self.chunks.append(self._tail)
+            self._tail = ""
+        self.complete = True
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_more(self):
+        """Wait until another chunk is added or the document is finished"""
+        if not self.complete:
+            await self._changed.wait()
+
+    async def wait_for_chunks(self, count: int):
+        while len(self.chunks) < count and not self.complete:
+            await self.wait_for_more()
+
+    async def wait_complete(self):
+        while not self.complete:
+            await self.wait_for_more()
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import math
+import os
+import re
+import time
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+SCHEMA = """CREATE TABLE IF NOT EXISTS question_dedup (
+    scope TEXT PRIMARY KEY,
+    current BLOB NOT NULL,
+    previous BLOB,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+)"""
+
+def question_digest(text: str) -> bytes:
+    """Stable 128-bit digest of a question, insensitive to case and spacing"""
+    normalized = re.sub(r'\s+', ' ', str(text)).strip().lower()
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 128-bit digests (double hashing)"""
+
+    def __init__(self, capacity: int, error_rate: float, bits: bytes = None):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.size += -self.size % 8
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits and len(bits) * 8 == self.size else bytearray(self.size // 8)
+
+    def _positions(self, digest: bytes):
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, digest: bytes):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+class SeenQuestions:
+    """Set-like record of the questions one scope has already been asked.
+
+    Backed by two generations of Bloom filters: when the current one reaches
+    capacity it becomes the previous one and a fresh filter takes over, so
+    memory per scope is fixed while the most recent ``2 * capacity``
+    questions are always remembered.
+    """
+
+    def __init__(self, owner: "QuestionDedup", scope: str, current: bytes = None, previous: bytes = None,
+                 count: int = 0, total: int = 0):
+        self.owner = owner
+        self.scope = scope
+        self.current = BloomFilter(owner.capacity, owner.error_rate, current)
+        self.previous = BloomFilter(owner.capacity, owner.error_rate, previous) if previous else None
+        self.count = count      # Questions in the current generation
+        self.total = total      # Questions ever added to this scope
+        self.dirty = False
+
+    def __contains__(self, question: str) -> bool:
+        digest = question_digest(question)
+        return digest in self.current or (self.previous is not None and digest in self.previous)
+
+    def __len__(self):
+        return self.total
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + len(self.current.bits) + (len(self.previous.bits) if self.previous else 0)
+
+    def add(self, question: str):
+        digest = question_digest(question)
+        if self.count >= self.owner.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.owner.capacity, self.owner.error_rate)
+            self.count = 0
+        self.current.add(digest)
+        self.count += 1
+        self.total += 1
+        self.dirty = True
+
+    def update(self, questions):
+        for question in questions:
+            self.add(question)
+
+    def clear(self):
+        self.current = BloomFilter(self.owner.capacity, self.owner.error_rate)
+        self.previous = None
+        self.count = 0
+        self.total = 0
+        self.dirty = True
+
+class QuestionDedup:
+    """Persistent, bounded-memory registry of asked questions per scope.
+
+    Scopes are free-form strings such as ``"mcquiz:<user>:<document>"``.
+    Loaded scopes are kept in a small LRU; changes are written back to the
+    SQLite store periodically, on eviction and on close, so dedup survives
+    restarts without growing in memory. A scope evicted from the LRU while a
+    quiz still holds it stays registered (weakly) until it is released, so
+    its later additions are still flushed and ``load()`` hands back the same
+    object instead of a stale copy.
+    """
+
+    def __init__(self, store, capacity: int = 5000, error_rate: float = 0.001,
+                 max_scopes: int = 256, flush_interval: float = 30.0):
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_scopes = max_scopes
+        self.flush_interval = flush_interval
+        self._scopes: OrderedDict[str, SeenQuestions] = OrderedDict()
+        self._evicted: list[SeenQuestions] = []   # Dirty scopes kept alive until their next flush
+        self._live: weakref.WeakValueDictionary[str, SeenQuestions] = weakref.WeakValueDictionary()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, store):
+        return cls(
+            store,
+            capacity=int(os.getenv('DEDUP_CAPACITY', 5000)),
+            max_scopes=int(os.getenv('DEDUP_MAX_SCOPES', 256))
+        )
+
+    async def open(self):
+        await self.store.run(lambda conn: conn.execute(SCHEMA))
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception as e:
+                    print(f"Failed to flush question dedup store: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    async def load(self, scope: str) -> SeenQuestions:
+        seen = self._scopes.get(scope) or self._live.get(scope)
+        if seen is not None:
+            self._remember(seen)
+            return seen
+
+        def query(conn):
+            return conn.execute(
+                "SELECT current, previous, count, total FROM question_dedup WHERE scope = ?", (scope,)
+            ).fetchone()
+
+        row = await self.store.run(query)
+        # Another caller may have loaded it while we were reading
+        seen = self._live.get(scope)
+        if seen is None:
+            seen = SeenQuestions(self, scope, *row) if row else SeenQuestions(self, scope)
+            self._live[scope] = seen
+        self._remember(seen)
+        return seen
+
+    def _remember(self, seen: SeenQuestions):
+        self._scopes[seen.scope] = seen
+        self._scopes.move_to_end(seen.scope)
+        while len(self._scopes) > self.max_scopes:
+            _, evicted = self._scopes.popitem(last=False)
+            if evicted.dirty:
+                self._evicted.append(evicted)
+
+    async def flush(self):
+        # Every scope still in use is in _live, including ones evicted from the LRU mid-quiz
+        dirty = [seen for seen in list(self._live.values()) if seen.dirty]
+        self._evicted = []
+        if not dirty:
+            return
+        rows = []
+        for seen in dirty:
+            seen.dirty = False
+            rows.append((
+                seen.scope, bytes(seen.current.bits),
+                bytes(seen.previous.bits) if seen.previous else None,
+                seen.count, seen.total, time.time()
+            ))
+
+        def write(conn):
+            conn.executemany(
+                """INSERT OR REPLACE INTO question_dedup (scope, current, previous, count, total, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+        await self.store.run(write)
@@ -0,0 +1,82 @@
+import asyncio
+import discord
+from typing import Callable, Optional
+
+class ReactionDispatcher:
+    """Route reaction events to the game waiting on that message in O(1).
+
+    Every game used to register its own ``bot.wait_for('reaction_add')``, so
+    each reaction was checked against every pending game. Here a single raw
+    listener looks the message id up in a dict and calls only that handler.
+    Handlers receive ``(emoji, user)`` with the emoji as a string; the bot's
+    own reactions are never delivered.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers: dict[int, Callable] = {}
+        self.dispatched = 0
+
+    def attach(self):
+        self.bot.add_listener(self.on_raw_reaction_add, 'on_raw_reaction_add')
+
+    def register(self, message_id: int, handler: Callable):
+        self.handlers[message_id] = handler
+
+    def unregister(self, message_id: int):
+        self.handlers.pop(message_id, None)
+
+    def release(self, message_id: int):
+        """Drop the handler for a message, waking it with ``(None, None)``"""
+        handler = self.handlers.pop(message_id, None)
+        if handler is not None:
+            handler(None, None)
+
+    async def wait_for(self, message_id: int, check: Callable = None, timeout: float = None) -> Optional[tuple]:
+        """Wait for a reaction on one message; None if released, TimeoutError on timeout"""
+        future = asyncio.get_running_loop().create_future()
+
+        def handler(emoji, user):
+            if future.done():
+                return
+            if emoji is None:
+                future.set_result(None)
+            elif check is None or check(emoji, user):
+                future.set_result((emoji, user))
+
+        self.register(message_id, handler)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            if self.handlers.get(message_id) is handler:
+                self.unregister(message_id)
+
+    def seed(self, message, emojis: list) -> asyncio.Task:
+        """Add answer reactions in the background so the wait can start right away.
+
+        Discord rate-limits reactions per channel, so the calls run one after
+        another (which also keeps them in order) but off the caller's path.
+        Cancel the returned task once the round is over.
+        """
+        async def add_all():
+            for emoji in emojis:
+                try:
+                    await message.add_reaction(emoji)
+                except discord.HTTPException as e:
+                    print(f"Failed to add reaction {emoji}: {e}")
+
+        return asyncio.create_task(add_all())
+
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        handler = self.handlers.get(payload.message_id)
+        if handler is None or payload.user_id == self.bot.user.id:
+            return
+        user = payload.member or self.bot.get_user(payload.user_id)
+        if user is None:
+            try:
+                user = await self.bot.fetch_user(payload.user_id)
+            except discord.HTTPException as e:
+                print(f"Failed to resolve reacting user {payload.user_id}: {e}")
+                return
+        self.dispatched += 1
+        handler(str(payload.emoji), user)
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import time
+from typing import Awaitable, Callable, Optional
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS documents (
+        digest TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        batches TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_used REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS document_files (
+        file_digest TEXT PRIMARY KEY,
+        digest TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS documents_last_used ON documents (last_used)",
+)
+
+def digest(data) -> str:
+    """SHA-256 of raw bytes or of UTF-8 text"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+class DocumentCache:
+    """Content-addressed cache of quiz documents shared by every user.
+
+    Documents are keyed by the digest of their extracted text and hold the
+    text plus named batches of validated questions (e.g. one per chunk).
+    Uploaded files are mapped from the digest of their raw bytes to the text
+    digest, so a repeat upload skips extraction and generation entirely.
+    Everything lives in the bot's SQLite store; the least recently used
+    documents are evicted once the total size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, store, max_bytes: int = 64 * 1024 * 1024):
+        self.store = store
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls, store):
+        return cls(store, max_bytes=int(os.getenv('DOCUMENT_CACHE_MAX_BYTES', 64 * 1024 * 1024)))
+
+    async def open(self):
+        def create(conn):
+            for statement in SCHEMA:
+                conn.execute(statement)
+        await self.store.run(create)
+
+    async def extract(self, file_data: bytes, filename: str,
+                      extract: Callable[[bytes, str], Awaitable[str]]) -> str:
+        """Text for an uploaded file, running ``extract`` only on a cache miss"""
+        file_digest = digest(file_data)
+        text = await self.lookup_file(file_digest)
+        if text is not None:
+            return text
+
+        text = await extract(file_data, filename)
+        if text:
+            await self.put_text(text, file_digest=file_digest)
+        return text
+
+    async def lookup_file(self, file_digest: str) -> Optional[str]:
+        """Previously extracted text for an uploaded file, if still cached"""
+        def lookup(conn):
+            row = conn.execute(
+                """SELECT d.digest, d.text FROM document_files f JOIN documents d ON d.digest = f.digest
+                   WHERE f.file_digest = ?""",
+                (file_digest,)
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE documents SET last_used = ? WHERE digest = ?", (time.time(), row[0]))
+            return row
+
+        row = await self.store.run(lookup)
+        if row:
+            self.hits += 1
+            return row[1]
+        self.misses += 1
+        return None
+
+    async def put_text(self, text: str, file_digest: str = None) -> str:
+        """Register a document (and optionally the file it came from); returns its digest"""
+        text_digest = digest(text)
+        now = time.time()
+
+        def write(conn):
+            conn.execute(
+                """INSERT INTO documents (digest, text, batches, size, last_used) VALUES (?, ?, '{}', ?, ?)
+                   ON CONFLICT (digest) DO UPDATE SET last_used = excluded.last_used""",
+                (text_digest, text, len(text.encode('utf-8')), now)
+            )
+            if file_digest:
+                conn.execute(
+                    "INSERT OR REPLACE INTO document_files (file_digest, digest) VALUES (?, ?)",
+                    (file_digest, text_digest)
+                )
+            self._evict(conn)
+
+        await self.store.run(write)
+        return text_digest
+
+    async def get_text(self, text_digest: str) -> Optional[str]:
+        """A registered document's text, if it has not been evicted"""
+        def query(conn):
+            row = conn.execute("SELECT text FROM documents WHERE digest = ?", (text_digest,)).fetchone()
+            if row:
+                conn.execute("UPDATE documents SET last_used = ? WHERE digest = ?", (time.time(), text_digest))
+            return row
+
+        row = await self.store.run(query)
+        return row[0] if row else None
+
+    async def get_batches(self, text_digest: str) -> dict[str, list]:
+        """Question batches already generated for a document, by batch name"""
+        def query(conn):
+            row = conn.execute("SELECT batches FROM documents WHERE digest = ?", (text_digest,)).fetchone()
+            if row:
+                conn.execute("UPDATE documents SET last_used = ? WHERE digest = ?", (time.time(), text_digest))
+            return row
+
+        row = await self.store.run(query)
+        return json.loads(row[0]) if row else {}
+
+    async def put_batch(self, text_digest: str, name: str, questions: list):
+        """Add a batch of validated questions to a document's pool"""
+        def write(conn):
+            row = conn.execute("SELECT text, batches FROM documents WHERE digest = ?", (text_digest,)).fetchone()
+            if row is None:
+                return
+            batches = json.loads(row[1])
+            batches[name] = questions
+            encoded = json.dumps(batches)
+            conn.execute(
+                "UPDATE documents SET batches = ?, size = ?, last_used = ? WHERE digest = ?",
+                (encoded, len(row[0].encode('utf-8')) + len(encoded), time.time(), text_digest)
+            )
+            self._evict(conn)
+
+        await self.store.run(write)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for document_digest, size in conn.execute("SELECT digest, size FROM documents ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM documents WHERE digest = ?", (document_digest,))
+            conn.execute("DELETE FROM document_files WHERE digest = ?", (document_digest,))
+            total -= size
+            self.evictions += 1
+
+    async def stats(self) -> dict:
+        def query(conn):
+            return conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM documents").fetchone()
+        count, size = await self.store.run(query)
+        return {
+            "documents": count,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,290 @@
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+SUPPORTED_EXTENSIONS = ('.txt', '.pdf', '.docx', '.pptx')
+
+class ExtractionError(Exception):
+    """A document could not be turned into text; the message is safe to show users"""
+
+def _address_space() -> int:
+    """Virtual memory this process already maps (0 where /proc is unavailable)"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmSize:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def _limit_memory(max_bytes: int):
+    # Runs once in each worker process; the cap is on top of what the interpreter already maps
+    try:
+        import resource
+        limit = _address_space() + max_bytes
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"Could not cap extraction worker memory: {e}")
+
+def _slide_text(slide) -> str:
+    text_content = []
+    # Extract text from shapes
+    for shape in slide.shapes:
+        if hasattr(shape, "text") and shape.text.strip():
+            text_content.append(shape.text.strip())
+
+        # Handle tables specifically
+        if shape.has_table:
+            for row in shape.table.rows:
+                for cell in row.cells:
+                    if cell.text.strip():
+                        text_content.append(cell.text.strip())
+
+        # Handle text frames
+        if hasattr(shape, "text_frame"):
+            for paragraph in shape.text_frame.paragraphs:
+                if paragraph.text.strip():
+                    text_content.append(paragraph.text.strip())
+
+    return "\n".join(text_content)
+
+def _extract_pptx(file_data: bytes) -> str:
+    from pptx import Presentation
+    presentation = Presentation(io.BytesIO(file_data))
+    return "\n".join(text for text in map(_slide_text, presentation.slides) if text)
+
+def _extract_docx(file_data: bytes) -> str:
+    import docx
+    doc = docx.Document(io.BytesIO(file_data))
+    return "\n".join(p.text.strip() for p in doc.paragraphs if p.text.strip())
+
+def _extract_pdf(file_data: bytes) -> str:
+    import PyPDF2
+    pdf = PyPDF2.PdfReader(io.BytesIO(file_data))
+    pages = []
+    for page in pdf.pages:
+        text = page.extract_text() or ""
+        if text.strip():
+            pages.append(text.strip())
+    return "\n".join(pages)
+
+def _extract(file_data: bytes, filename: str) -> str:
+    """Worker entry point: pick a parser by extension and return plain text"""
+    name = filename.lower()
+    if name.endswith('.pptx'):
+        return _extract_pptx(file_data).strip()
+    if name.endswith('.docx'):
+        return _extract_docx(file_data).strip()
+    if name.endswith('.pdf'):
+        return _extract_pdf(file_data).strip()
+    if name.endswith('.txt'):
+        return file_data.decode('utf-8').strip()
+    raise ValueError(f"unsupported file type: {filename}")
+
+def _iter_pages(file_data: bytes, filename: str):
+    """Text of each page/slide in order, from a single parse of the document"""
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        import PyPDF2
+        for page in PyPDF2.PdfReader(io.BytesIO(file_data)).pages:
+            yield (page.extract_text() or "").strip()
+    elif name.endswith('.pptx'):
+        from pptx import Presentation
+        for slide in Presentation(io.BytesIO(file_data)).slides:
+            yield _slide_text(slide)
+    else:
+        # DOCX and TXT have no pages; they come back as a single block
+        yield _extract(file_data, filename)
+
+def _stream_pages(file_data: bytes, filename: str, max_memory: int, conn, first_pages: int, max_pages: int):
+    """Worker process for streaming: send pages back over ``conn`` in growing batches"""
+    _limit_memory(max_memory)
+    batch, size = [], first_pages
+    try:
+        for page in _iter_pages(file_data, filename):
+            batch.append(page)
+            if len(batch) >= size:
+                conn.send(("pages", batch))
+                batch, size = [], min(size * 2, max_pages)
+        if batch:
+            conn.send(("pages", batch))
+        conn.send(("done", None))
+    except MemoryError:
+        conn.send(("memory", None))
+    except UnicodeDecodeError:
+        conn.send(("encoding", None))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+class DocumentExtractor:
+    """Turn uploaded documents into text in a pool of worker processes.
+
+    Parsing PDFs, DOCX and PPTX is CPU-bound and can take seconds, so it runs
+    off the event loop in separate processes. Each worker has an address-space
+    cap and each job a timeout; a job that overruns either gets its pool torn
+    down and replaced so a hostile file cannot wedge later uploads.
+
+    Streamed documents get a process of their own instead: it parses the file
+    once and sends pages back as it goes, and is killed on its own if it
+    stalls for longer than the timeout.
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: float = 60.0, max_memory: int = 512 * 1024 * 1024,
+                 first_pages: int = 5, max_pages_per_job: int = 50):
+        self.max_workers = max_workers
+        self.first_pages = first_pages
+        self.max_pages_per_job = max_pages_per_job
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.jobs = 0
+        self.failures = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._streams = asyncio.Semaphore(max_workers)  # Documents streaming at once
+        # Waits on streaming workers block for up to the timeout; keep them off the default executor.
+        # A stream holds one thread at a time; the headroom covers waits still running after a stream was abandoned.
+        self._waiters = ThreadPoolExecutor(max_workers=max_workers * 2, thread_name_prefix="extract-wait")
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_workers=int(os.getenv('EXTRACT_WORKERS', 2)),
+            timeout=float(os.getenv('EXTRACT_TIMEOUT', 60)),
+            max_memory=int(os.getenv('EXTRACT_MAX_MEMORY_MB', 512)) * 1024 * 1024
+        )
+
+    @staticmethod
+    def supports(filename: str) -> bool:
+        return filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # Fresh interpreters rather than forks of the bot, which carry its threads and address space
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_limit_memory,
+                initargs=(self.max_memory,)
+            )
+        return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor):
+        """Tear down ``pool`` if it is still the current one (another failure may have replaced it)"""
+        if pool is None or pool is not self._pool:
+            return
+        self._pool = None
+        # Stuck workers never finish on their own; kill them so the slots come back
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, file_data: bytes, filename: str) -> str:
+        """Extract text from one document, raising ExtractionError on failure"""
+        text = await self._run(_extract, file_data, filename)
+        print(f"Successfully processed {filename}, extracted {len(text)} chars")
+        return text
+
+    async def iter_pages(self, file_data: bytes, filename: str):
+        """Yield the text of each page/slide as soon as it is parsed.
+
+        One worker process parses the whole document and sends pages back in
+        batches, starting with ``first_pages`` so a quiz can start quickly and
+        growing up to ``max_pages_per_job``. The timeout applies to each wait
+        for the next batch.
+        """
+        if not self.supports(filename):
+            raise ExtractionError("Invalid file type. Please use .txt, .pdf, .docx, or .pptx files.")
+
+        self.jobs += 1
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context('spawn')
+        async with self._streams:
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_stream_pages,
+                args=(file_data, filename, self.max_memory, sender, self.first_pages, self.max_pages_per_job),
+                daemon=True
+            )
+            process.start()
+            sender.close()
+            try:
+                while True:
+                    if not await loop.run_in_executor(self._waiters, receiver.poll, self.timeout):
+                        self.failures += 1
+                        raise ExtractionError(f"Processing took longer than {self.timeout:.0f} seconds")
+                    try:
+                        kind, payload = await loop.run_in_executor(self._waiters, receiver.recv)
+                    except EOFError:
+                        # The worker died without reporting, e.g. killed for exceeding its memory cap
+                        kind, payload = "memory", None
+                    if kind == "pages":
+                        for page in payload:
+                            yield page
+                        continue
+                    if kind == "done":
+                        return
+                    self.failures += 1
+                    if kind == "memory":
+                        raise ExtractionError("The file is too large to process")
+                    if kind == "encoding":
+                        raise ExtractionError("Text files must be UTF-8 encoded")
+                    print(f"Error processing file {filename}: {payload}")
+                    raise ExtractionError(payload)
+            finally:
+                receiver.close()
+                if process.is_alive():
+                    process.kill()
+                await loop.run_in_executor(self._waiters, process.join)
+
+    async def _run(self, fn, file_data: bytes, filename: str, *args):
+        if not self.supports(filename):
+            raise ExtractionError("Invalid file type. Please use .txt, .pdf, .docx, or .pptx files.")
+
+        self.jobs += 1
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._get_pool()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(pool, fn, file_data, filename, *args),
+                    self.timeout
+                )
+            except asyncio.TimeoutError:
+                self.failures += 1
+                self._reset_pool(pool)
+                raise ExtractionError(f"Processing took longer than {self.timeout:.0f} seconds")
+            except BrokenProcessPool:
+                if pool is not self._pool and attempt == 0:
+                    # Torn down because of someone else's job; run this one again on the new pool
+                    continue
+                self.failures += 1
+                self._reset_pool(pool)
+                raise ExtractionError("The file is too large to process")
+            except MemoryError:
+                self.failures += 1
+                raise ExtractionError("The file is too large to process")
+            except UnicodeDecodeError:
+                self.failures += 1
+                raise ExtractionError("Text files must be UTF-8 encoded")
+            except Exception as e:
+                self.failures += 1
+                print(f"Error processing file {filename}: {e}")
+                raise ExtractionError(str(e))
+
+    def stats(self) -> dict:
+        return {
+            "jobs": self.jobs,
+            "failures": self.failures
+        }
+
+    def close(self):
+        self._waiters.shutdown(wait=False, cancel_futures=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
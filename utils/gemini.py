@@ -0,0 +1,145 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable
+
+class GeminiBudget:
+    """Bot-wide concurrency and requests-per-minute budget for Gemini calls.
+
+    Every cog that talks to Gemini goes through ``generate()``. Calls that
+    cannot start immediately are queued per owner (usually the user id) and
+    admitted round-robin, so one user's bulk document generation cannot
+    starve another user's interactive quiz. The blocking SDK calls run on the
+    budget's own threads, so long streamed responses never tie up the
+    default executor that DNS lookups and ``asyncio.to_thread`` rely on.
+    """
+
+    WINDOW = 60.0
+
+    def __init__(self, max_concurrent: int = 4, requests_per_minute: int = 60):
+        self.max_concurrent = max(1, max_concurrent)
+        self.requests_per_minute = max(1, requests_per_minute)
+        self.active = 0
+        self.calls = 0
+        self.queued = 0
+        self._waiters: OrderedDict[Hashable, deque] = OrderedDict()
+        self._sent = deque()
+        # One thread per slot, plus headroom for streams still unwinding after their slot was released
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent * 2, thread_name_prefix="gemini")
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_concurrent=int(os.getenv('GEMINI_MAX_CONCURRENT', 4)),
+            requests_per_minute=int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', 60))
+        )
+
+    async def _acquire(self, owner: Hashable):
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(owner, deque()).append(future)
+        self.queued += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled
+                self._release()
+            else:
+                self._discard(owner, future)
+            raise
+
+    def _discard(self, owner: Hashable, future: asyncio.Future):
+        waiters = self._waiters.get(owner)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                del self._waiters[owner]
+
+    def _release(self):
+        self.active -= 1
+        while self.active < self.max_concurrent and self._waiters:
+            owner, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+            if waiters:
+                self._waiters.move_to_end(owner)
+            else:
+                del self._waiters[owner]
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    async def _wait_for_rate(self):
+        while True:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= self.WINDOW:
+                self._sent.popleft()
+            if len(self._sent) < self.requests_per_minute:
+                self._sent.append(now)
+                return
+            await asyncio.sleep(self.WINDOW - (now - self._sent[0]))
+
+    async def generate(self, model, prompt: str, owner: Hashable = None):
+        """Run ``model.generate_content(prompt)`` in a thread once the budget allows"""
+        await self._acquire(owner)
+        try:
+            await self._wait_for_rate()
+            self.calls += 1
+            return await asyncio.get_running_loop().run_in_executor(self._executor, model.generate_content, prompt)
+        finally:
+            self._release()
+
+    async def stream(self, model, prompt: str, owner: Hashable = None):
+        """Like ``generate()``, but yields the response text piece by piece as it is produced.
+
+        The budget slot is held until the response ends or the caller stops iterating.
+        """
+        await self._acquire(owner)
+        try:
+            await self._wait_for_rate()
+            self.calls += 1
+            loop = asyncio.get_running_loop()
+            pieces = asyncio.Queue()
+            stop = threading.Event()
+
+            def produce():
+                # Runs in a worker thread; the SDK's streaming iterator is blocking
+                try:
+                    for chunk in model.generate_content(prompt, stream=True):
+                        if stop.is_set():
+                            break
+                        loop.call_soon_threadsafe(pieces.put_nowait, chunk.text)
+                except Exception as e:
+                    loop.call_soon_threadsafe(pieces.put_nowait, e)
+                finally:
+                    loop.call_soon_threadsafe(pieces.put_nowait, None)
+
+            loop.run_in_executor(self._executor, produce)
+            try:
+                while True:
+                    piece = await pieces.get()
+                    if piece is None:
+                        return
+                    if isinstance(piece, Exception):
+                        raise piece
+                    yield piece
+            finally:
+                stop.set()
+        finally:
+            self._release()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "waiting": sum(len(waiters) for waiters in self._waiters.values()),
+            "calls": self.calls,
+            "queued": self.queued
+        }
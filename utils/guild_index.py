@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Optional
+
+class FenwickTree:
+    """Binary indexed tree over 0/1 slots supporting appends, point updates and prefix sums"""
+
+    def __init__(self, values: list = None):
+        values = values or []
+        self._tree = [0] * (len(values) + 1)
+        for i, value in enumerate(values, 1):
+            self._tree[i] += value
+            parent = i + (i & -i)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self):
+        return len(self._tree) - 1
+
+    def add(self, index: int, delta: int):
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """Sum of slots 0..index inclusive"""
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def append(self, value: int):
+        # The new node covers (i - lowbit(i), i]; fill it from existing prefix sums
+        i = len(self._tree)
+        lowbit = i & -i
+        covered = self.prefix_sum(i - 2) - self.prefix_sum(i - lowbit - 1) if lowbit > 1 else 0
+        self._tree.append(value + covered)
+
+class GuildMemberIndex:
+    """Per-guild member counters and join-order index kept up to date from gateway events.
+
+    Members occupy slots ordered by join time; a Fenwick tree over the slots
+    answers "how many current members joined before this one" in O(log n).
+    New joins are always the newest, so they are appended to the end.
+    """
+
+    def __init__(self, members: list[tuple[int, Optional[datetime], bool, bool]] = ()):
+        # members: (member_id, joined_at, is_bot, is_online)
+        ordered = sorted(members, key=lambda m: (m[1] is None, m[1] or datetime.max, m[0]))
+        self.slots = {member_id: slot for slot, (member_id, *_rest) in enumerate(ordered)}
+        self.tree = FenwickTree([1] * len(ordered))
+        self.bots = {member_id for member_id, _joined, is_bot, _online in ordered if is_bot}
+        self.online = {member_id for member_id, _joined, _bot, is_online in ordered if is_online}
+
+    @property
+    def member_count(self) -> int:
+        return len(self.slots)
+
+    @property
+    def bot_count(self) -> int:
+        return len(self.bots)
+
+    @property
+    def online_count(self) -> int:
+        return len(self.online)
+
+    def add_member(self, member_id: int, is_bot: bool, is_online: bool = False):
+        if member_id in self.slots:
+            return
+        self.slots[member_id] = len(self.tree)
+        self.tree.append(1)
+        if is_bot:
+            self.bots.add(member_id)
+        if is_online:
+            self.online.add(member_id)
+
+    def remove_member(self, member_id: int):
+        slot = self.slots.pop(member_id, None)
+        if slot is None:
+            return
+        self.tree.add(slot, -1)
+        self.bots.discard(member_id)
+        self.online.discard(member_id)
+
+    def set_online(self, member_id: int, is_online: bool):
+        if member_id not in self.slots:
+            return
+        if is_online:
+            self.online.add(member_id)
+        else:
+            self.online.discard(member_id)
+
+    def join_position(self, member_id: int) -> Optional[int]:
+        """1-based join position among current members"""
+        slot = self.slots.get(member_id)
+        if slot is None:
+            return None
+        return self.tree.prefix_sum(slot)
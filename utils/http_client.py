@@ -0,0 +1,124 @@
+import os
+import json as jsonlib
+import aiohttp
+from typing import Any, Optional
+from .cache import ResponseCache
+from .singleflight import SingleFlight
+
+# Query parameters that carry secrets; they never become part of a cache key
+CREDENTIAL_PARAMS = frozenset({"apikey", "api_key", "key", "token", "access_token", "client_secret", "password"})
+
+class HTTPClient:
+    """Bot-wide pooled HTTP client shared by every cog.
+
+    One aiohttp session is kept open for the lifetime of the bot so commands
+    reuse warm keep-alive connections instead of paying DNS + TCP + TLS setup
+    on every invocation.
+    """
+
+    def __init__(self, *, total_timeout: float = 15.0, connect_timeout: float = 5.0,
+                 limit: int = 100, limit_per_host: int = 10,
+                 dns_cache_ttl: int = 300, keepalive_timeout: float = 30.0):
+        self.total_timeout = total_timeout
+        self.connect_timeout = connect_timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.cache = ResponseCache.from_env()
+        self.inflight = SingleFlight()
+
+    @classmethod
+    def from_env(cls) -> "HTTPClient":
+        """Build a client using HTTP_* environment overrides where present"""
+        return cls(
+            total_timeout=float(os.getenv('HTTP_TOTAL_TIMEOUT', 15.0)),
+            connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', 5.0)),
+            limit=int(os.getenv('HTTP_POOL_LIMIT', 100)),
+            limit_per_host=int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', 10)),
+            dns_cache_ttl=int(os.getenv('HTTP_DNS_CACHE_TTL', 300)),
+            keepalive_timeout=float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30.0))
+        )
+
+    async def start(self):
+        """Open the pooled session. Must be called from inside the running loop."""
+        if self._session and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        timeout = aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self):
+        """Close the session and release every pooled connection"""
+        self.cache.cancel_refreshes()
+        self.inflight.cancel_all()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if not self._session or self._session.closed:
+            raise RuntimeError("HTTPClient has not been started")
+        return self._session
+
+    def get(self, url: str, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    async def fetch_json(self, method: str, url: str, *, params: dict = None,
+                         headers: dict = None, json: Any = None, cache: str = None,
+                         coalesce: bool = True) -> tuple[int, Any]:
+        """Perform a request and decode the JSON body.
+
+        Returns a ``(status, data)`` tuple; ``data`` is None for non-200 responses.
+        Pass ``cache`` with a policy name from ``utils.cache`` to serve repeated
+        requests from the shared response cache. Identical requests already in
+        flight are shared unless ``coalesce`` is False (e.g. for endpoints that
+        return a different random result on every call).
+        """
+        key = (method.upper(), url, self._freeze(params), self._freeze(json))
+
+        def fetch():
+            request = lambda: self._request_json(method, url, params, headers, json)
+            return self.inflight.do(key, request) if coalesce else request()
+
+        if cache is None:
+            result, _ = await fetch()
+            return result
+
+        # Cache keys are persisted to disk, so drop credentials (one key per bot, so this is safe)
+        return await self.cache.get_or_fetch(
+            (key[0], url, self._freeze(self._public(params)), key[3]),
+            cache,
+            fetch,
+            cacheable=lambda result: result[0] == 200
+        )
+
+    async def _request_json(self, method, url, params, headers, json):
+        async with self.session.request(method, url, params=params, headers=headers, json=json) as resp:
+            if resp.status != 200:
+                return (resp.status, None), 0
+            body = await resp.read()
+            return (resp.status, jsonlib.loads(body)), len(body)
+
+    @staticmethod
+    def _public(params: Optional[dict]) -> Optional[dict]:
+        if not params:
+            return params
+        return {name: value for name, value in params.items() if str(name).lower() not in CREDENTIAL_PARAMS}
+
+    @staticmethod
+    def _freeze(value) -> Optional[str]:
+        if value is None:
+            return None
+        return jsonlib.dumps(value, sort_keys=True, default=str)
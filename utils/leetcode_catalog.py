@@ -0,0 +1,178 @@
+import asyncio
+import time
+from typing import Optional
+
+GRAPHQL_URL = "https://leetcode.com/graphql"
+
+PROBLEMSET_QUERY = """
+query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+    problemsetQuestionList: questionList(
+        categorySlug: $categorySlug
+        limit: $limit
+        skip: $skip
+        filters: $filters
+    ) {
+        total: totalNum
+        questions: data {
+            questionId
+            questionFrontendId
+            title
+            titleSlug
+            difficulty
+            isPaidOnly
+            topicTags {
+                name
+            }
+        }
+    }
+}
+"""
+
+CONTENT_QUERY = """
+query questionContent($titleSlug: String!) {
+    question(titleSlug: $titleSlug) {
+        content
+    }
+}
+"""
+
+class ProblemCatalog:
+    """Local index of LeetCode problem metadata keyed by frontend id and slug.
+
+    The full problemset is paged in the background (metadata only, no HTML
+    bodies) and re-synced periodically. Problem content is fetched lazily per
+    slug through the shared response cache. When a store is given, the
+    catalog is persisted after every sync and rehydrated from disk on startup.
+    """
+
+    NAMESPACE = "leetcode_catalog"
+
+    def __init__(self, http_client, headers: dict = None, page_size: int = 500,
+                 resync_interval: float = 12 * 3600, store=None):
+        self.http_client = http_client
+        self.store = store
+        self.headers = headers or {}
+        self.page_size = page_size
+        self.resync_interval = resync_interval
+        self.by_frontend_id: dict[int, dict] = {}
+        self.by_slug: dict[str, dict] = {}
+        self.last_synced = 0.0
+        self._loaded = asyncio.Event()
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Kick off the background sync loop"""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    def stop(self):
+        if self._sync_task:
+            self._sync_task.cancel()
+            self._sync_task = None
+
+    async def _sync_loop(self):
+        try:
+            if await self._load_from_store():
+                # The persisted copy is good enough until it is due for a refresh
+                await asyncio.sleep(max(0, self.last_synced + self.resync_interval - time.time()))
+            while True:
+                try:
+                    await self.sync()
+                except Exception as e:
+                    print(f"LeetCode catalog sync failed: {e}")
+                await asyncio.sleep(self.resync_interval if self._loaded.is_set() else 60)
+        except asyncio.CancelledError:
+            pass
+
+    async def sync(self):
+        """Page through the whole problemset and rebuild both indexes"""
+        problems = []
+        skip = 0
+        total = None
+
+        while total is None or skip < total:
+            status, result = await self.http_client.fetch_json(
+                "POST",
+                GRAPHQL_URL,
+                headers=self.headers,
+                json={
+                    "query": PROBLEMSET_QUERY,
+                    "variables": {"categorySlug": "", "skip": skip, "limit": self.page_size, "filters": {}}
+                }
+            )
+            if status != 200 or not result:
+                raise RuntimeError(f"problemset page at skip={skip} returned status {status}")
+
+            page = result.get('data', {}).get('problemsetQuestionList') or {}
+            questions = page.get('questions') or []
+            total = page.get('total', 0)
+            if not questions:
+                break
+
+            problems.extend(questions)
+            skip += len(questions)
+
+        if problems:
+            self._index(problems, time.time())
+            print(f"LeetCode catalog synced: {len(self.by_frontend_id)} problems")
+            if self.store is not None:
+                await self.store.set(
+                    self.NAMESPACE, "problems",
+                    {"synced_at": self.last_synced, "problems": problems}
+                )
+
+    def _index(self, problems: list, synced_at: float):
+        by_frontend_id = {}
+        for q in problems:
+            try:
+                by_frontend_id[int(q['questionFrontendId'])] = q
+            except (KeyError, TypeError, ValueError):
+                pass
+        self.by_frontend_id = by_frontend_id
+        self.by_slug = {q['titleSlug']: q for q in problems}
+        self.last_synced = synced_at
+        self._loaded.set()
+
+    async def _load_from_store(self) -> bool:
+        if self.store is None:
+            return False
+        try:
+            snapshot = await self.store.get(self.NAMESPACE, "problems")
+        except Exception as e:
+            print(f"Failed to load LeetCode catalog from store: {e}")
+            return False
+        if not snapshot or not snapshot.get("problems"):
+            return False
+        self._index(snapshot["problems"], snapshot.get("synced_at", 0.0))
+        print(f"LeetCode catalog loaded from store: {len(self.by_frontend_id)} problems")
+        return True
+
+    async def wait_until_loaded(self, timeout: float = 30.0) -> bool:
+        if self._loaded.is_set():
+            return True
+        self.start()
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get(self, frontend_id: int) -> Optional[dict]:
+        return self.by_frontend_id.get(frontend_id)
+
+    def get_by_slug(self, slug: str) -> Optional[dict]:
+        return self.by_slug.get(slug)
+
+    async def get_content(self, slug: str) -> Optional[str]:
+        """Fetch the HTML body for a single problem (cached per slug)"""
+        status, result = await self.http_client.fetch_json(
+            "POST",
+            GRAPHQL_URL,
+            headers=self.headers,
+            json={"query": CONTENT_QUERY, "variables": {"titleSlug": slug}},
+            cache="leetcode_content"
+        )
+        if status != 200 or not result:
+            return None
+        question = (result.get('data') or {}).get('question') or {}
+        return question.get('content')
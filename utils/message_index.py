@@ -0,0 +1,225 @@
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS message_rollup (
+        guild_id INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        dimension TEXT NOT NULL,
+        key TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (guild_id, dimension, bucket, key)
+    )""",
+    """CREATE TABLE IF NOT EXISTS message_index_channels (
+        guild_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        last_message_id INTEGER NOT NULL,
+        PRIMARY KEY (guild_id, channel_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS message_index_guilds (
+        guild_id INTEGER PRIMARY KEY,
+        indexed_since REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS message_index_live (
+        guild_id INTEGER NOT NULL,
+        live_since REAL NOT NULL,
+        live_until REAL NOT NULL,
+        PRIMARY KEY (guild_id, live_since)
+    )""",
+)
+
+def hour_bucket(when: datetime) -> int:
+    """Hours since the epoch (UTC) for a timestamp"""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp()) // 3600
+
+class MessageIndex:
+    """Persistent per-guild rollup of message activity in hourly buckets.
+
+    Counts are kept per channel, user and emoji, plus a per-bucket total from
+    which hour-of-day and weekday activity are derived. Increments are
+    buffered in memory and flushed in one transaction together with the
+    per-channel watermarks, so a crash never advances a watermark past counts
+    that were not written. Each flush also records how far live counting has
+    got (``live_since`` to the flush time), so a backfill after a restart can
+    skip messages that were already counted live.
+    """
+
+    def __init__(self, store, flush_interval: float = 10.0, max_pending: int = 20000):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = Counter()
+        self._pending_watermarks: dict[tuple[int, int], int] = {}
+        self._live: dict[int, float] = {}      # {guild_id: live_since} for this run
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def open(self):
+        def create(conn):
+            for statement in SCHEMA:
+                conn.execute(statement)
+        await self.store.run(create)
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception as e:
+                    print(f"Failed to flush message index: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    def record_message(self, guild_id: int, channel_id: int, author_id: int, is_bot: bool,
+                       created_at: datetime, emojis: list):
+        bucket = hour_bucket(created_at)
+        self._pending[(guild_id, bucket, "total", "")] += 1
+        self._pending[(guild_id, bucket, "channel", str(channel_id))] += 1
+        if not is_bot:
+            self._pending[(guild_id, bucket, "user", str(author_id))] += 1
+        for emoji in emojis:
+            self._pending[(guild_id, bucket, "emoji", emoji)] += 1
+        self._maybe_flush()
+
+    def record_reaction(self, guild_id: int, emoji: str, when: datetime, count: int = 1):
+        self._pending[(guild_id, hour_bucket(when), "emoji", emoji)] += count
+        self._maybe_flush()
+
+    def advance_watermark(self, guild_id: int, channel_id: int, message_id: int):
+        key = (guild_id, channel_id)
+        if message_id > self._pending_watermarks.get(key, 0):
+            self._pending_watermarks[key] = message_id
+
+    def start_live(self, guild_id: int, since: float):
+        """Messages created from ``since`` on are being counted live for this guild"""
+        self._live.setdefault(guild_id, since)
+
+    def _maybe_flush(self):
+        if len(self._pending) >= self.max_pending and not self._flush_lock.locked():
+            asyncio.create_task(self.flush())
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._pending and not self._pending_watermarks:
+                return
+            rows = [(g, b, d, k, c) for (g, b, d, k), c in self._pending.items()]
+            watermarks = [(g, ch, mid) for (g, ch), mid in self._pending_watermarks.items()]
+            # Every live message counted so far is in this flush
+            live = [(g, since, time.time()) for g, since in self._live.items()]
+            self._pending = Counter()
+            self._pending_watermarks = {}
+
+            def write(conn):
+                conn.executemany(
+                    """INSERT INTO message_rollup (guild_id, bucket, dimension, key, count) VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT (guild_id, dimension, bucket, key) DO UPDATE SET count = count + excluded.count""",
+                    rows
+                )
+                conn.executemany(
+                    """INSERT INTO message_index_channels (guild_id, channel_id, last_message_id) VALUES (?, ?, ?)
+                       ON CONFLICT (guild_id, channel_id)
+                       DO UPDATE SET last_message_id = MAX(last_message_id, excluded.last_message_id)""",
+                    watermarks
+                )
+                conn.executemany(
+                    """INSERT INTO message_index_live (guild_id, live_since, live_until) VALUES (?, ?, ?)
+                       ON CONFLICT (guild_id, live_since) DO UPDATE SET live_until = MAX(live_until, excluded.live_until)""",
+                    live
+                )
+
+            await self.store.run(write)
+
+    async def get_watermarks(self, guild_id: int) -> dict[int, int]:
+        def query(conn):
+            return conn.execute(
+                "SELECT channel_id, last_message_id FROM message_index_channels WHERE guild_id = ?", (guild_id,)
+            ).fetchall()
+        return dict(await self.store.run(query))
+
+    async def get_live_windows(self, guild_id: int, before: float) -> list[tuple[float, float]]:
+        """(since, until) ranges counted live by earlier runs that started before ``before``"""
+        def query(conn):
+            return conn.execute(
+                "SELECT live_since, live_until FROM message_index_live WHERE guild_id = ? AND live_since < ?",
+                (guild_id, before)
+            ).fetchall()
+        return [tuple(row) for row in await self.store.run(query)]
+
+    async def prune_live_windows(self, guild_id: int, before: float):
+        """Forget live ranges from earlier runs once every channel's watermark is past them"""
+        def write(conn):
+            conn.execute("DELETE FROM message_index_live WHERE guild_id = ? AND live_since < ?", (guild_id, before))
+        await self.store.run(write)
+
+    async def get_indexed_since(self, guild_id: int) -> Optional[float]:
+        def query(conn):
+            return conn.execute(
+                "SELECT indexed_since FROM message_index_guilds WHERE guild_id = ?", (guild_id,)
+            ).fetchone()
+        row = await self.store.run(query)
+        return row[0] if row else None
+
+    async def set_indexed_since(self, guild_id: int, since: float):
+        def write(conn):
+            conn.execute(
+                """INSERT INTO message_index_guilds (guild_id, indexed_since) VALUES (?, ?)
+                   ON CONFLICT (guild_id) DO UPDATE SET indexed_since = MIN(indexed_since, excluded.indexed_since)""",
+                (guild_id, since)
+            )
+        await self.store.run(write)
+
+    async def summary(self, guild_id: int, since: datetime, top_n: int = 5, top_emojis: int = 10) -> dict:
+        """Aggregate the rollup for one guild from ``since`` until now"""
+        await self.flush()
+        start = hour_bucket(since)
+
+        def query(conn):
+            def top(dimension, limit):
+                return conn.execute(
+                    """SELECT key, SUM(count) AS total FROM message_rollup
+                       WHERE guild_id = ? AND dimension = ? AND bucket >= ?
+                       GROUP BY key ORDER BY total DESC LIMIT ?""",
+                    (guild_id, dimension, start, limit)
+                ).fetchall()
+
+            total = conn.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM message_rollup WHERE guild_id = ? AND dimension = 'total' AND bucket >= ?",
+                (guild_id, start)
+            ).fetchone()[0]
+            hours = conn.execute(
+                """SELECT bucket % 24 AS hour, SUM(count) FROM message_rollup
+                   WHERE guild_id = ? AND dimension = 'total' AND bucket >= ? GROUP BY hour""",
+                (guild_id, start)
+            ).fetchall()
+            # Bucket 0 (1970-01-01) was a Thursday; shift so Monday == 0
+            weekdays = conn.execute(
+                """SELECT (bucket / 24 + 3) % 7 AS weekday, SUM(count) FROM message_rollup
+                   WHERE guild_id = ? AND dimension = 'total' AND bucket >= ? GROUP BY weekday""",
+                (guild_id, start)
+            ).fetchall()
+            return {
+                "total": total,
+                "channels": [(int(k), c) for k, c in top("channel", top_n)],
+                "users": [(int(k), c) for k, c in top("user", top_n)],
+                "emojis": top("emoji", top_emojis),
+                "hours": dict(hours),
+                "weekdays": dict(weekdays)
+            }
+
+        started = time.perf_counter()
+        result = await self.store.run(query)
+        result["query_ms"] = (time.perf_counter() - started) * 1000
+        return result
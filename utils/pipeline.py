@@ -0,0 +1,66 @@
+import asyncio
+from typing import Awaitable, Callable
+
+class Prefetcher:
+    """Run a batch producer ahead of its consumer with a bounded look-ahead.
+
+    ``produce()`` is awaited repeatedly in a background task. At most
+    ``depth`` batches are ever produced but not yet consumed (counting the
+    one being generated), so the next batch is built while the current one is
+    in use without running arbitrarily far ahead. With ``workers > 1`` that
+    many producers run concurrently (batches arrive in completion order).
+    A falsy batch or an exception retires a worker; the source is exhausted
+    once every worker has retired.
+    """
+
+    def __init__(self, produce: Callable[[], Awaitable], depth: int = 1, workers: int = 1):
+        self.produce = produce
+        self.depth = max(1, depth)
+        self.workers = max(1, workers)
+        self._ready = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.depth)
+        self._tasks: list[asyncio.Task] = []
+        self._live = 0
+        self._exhausted = False
+
+    def start(self):
+        if not self._tasks and not self._exhausted:
+            self._live = self.workers
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def _run(self):
+        try:
+            while True:
+                await self._slots.acquire()
+                try:
+                    batch = await self.produce()
+                except Exception as e:
+                    print(f"Prefetch producer failed: {e}")
+                    batch = None
+                if not batch:
+                    self._slots.release()
+                    return
+                self._ready.put_nowait(batch)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._live -= 1
+            if self._live == 0:
+                self._ready.put_nowait(None)
+
+    async def next(self):
+        """The next batch, or None once the producer is exhausted"""
+        if self._exhausted and self._ready.empty():
+            return None
+        self.start()
+        batch = await self._ready.get()
+        if batch is None:
+            self._exhausted = True
+        else:
+            # Consuming a batch frees a slot, so the next one starts generating now
+            self._slots.release()
+        return batch
+
+    def close(self):
+        for task in self._tasks:
+            task.cancel()
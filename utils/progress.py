@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+class ProgressReporter:
+    """Coalesce progress updates for a long-running job into throttled message edits.
+
+    ``update()`` never awaits: it records the latest state and lets a
+    background task edit the message at most once per ``interval`` seconds.
+    ``finish()`` cancels any pending edit and always writes the final state.
+    Either pass an existing ``message`` or a ``send`` callable that creates
+    it on the first flush.
+    """
+
+    def __init__(self, message=None, send: Optional[Callable[..., Awaitable]] = None, interval: float = 3.0):
+        if message is None and send is None:
+            raise ValueError("ProgressReporter needs a message or a send callable")
+        self.message = message
+        self.send = send
+        self.interval = interval
+        self.edits = 0
+        self._latest: Optional[dict] = None
+        self._last_flush = 0.0
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._finished = False
+
+    def update(self, **fields):
+        """Record the newest state (``content``/``embed``/``view`` kwargs)"""
+        if self._finished:
+            return
+        self._latest = fields
+        self._dirty.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while True:
+                await self._dirty.wait()
+                delay = self._last_flush + self.interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._dirty.clear()
+                await self._flush(self._latest)
+        except asyncio.CancelledError:
+            pass
+
+    async def _flush(self, fields: Optional[dict]):
+        if not fields:
+            return
+        self._last_flush = time.monotonic()
+        # Shielded so cancelling the background loop never aborts a half-sent edit
+        self._inflight = asyncio.ensure_future(self._write(fields))
+        await asyncio.shield(self._inflight)
+
+    async def _stop(self):
+        self._finished = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._inflight is not None and not self._inflight.done():
+            await asyncio.gather(self._inflight, return_exceptions=True)
+
+    async def _write(self, fields: dict):
+        try:
+            if self.message is None:
+                self.message = await self.send(**fields)
+            else:
+                await self.message.edit(**fields)
+            self.edits += 1
+        except Exception as e:
+            print(f"Failed to update progress message: {e}")
+
+    async def finish(self, **fields):
+        """Stop background updates and write the final state immediately"""
+        await self._stop()
+        await self._flush(fields or self._latest)
+
+    async def delete(self):
+        """Stop background updates and remove the progress message"""
+        await self._stop()
+        if self.message is not None:
+            try:
+                await self.message.delete()
+            except Exception as e:
+                print(f"Failed to delete progress message: {e}")
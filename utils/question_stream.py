@@ -0,0 +1,183 @@
+import asyncio
+import json
+import re
+from typing import AsyncIterable, Callable, Optional
+
+class QuestionParser:
+    """Incrementally pull complete question objects out of a streamed
+    ``{"questions": [...]}`` response, ignoring any text around the JSON.
+    """
+
+    def __init__(self):
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._start: Optional[int] = None
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> list[dict]:
+        """Add the next piece of the response; returns the questions it completed"""
+        found = []
+        if self.done:
+            return found
+        self._buffer += text
+        if not self._in_array:
+            match = re.search(r'"questions"\s*:\s*\[', self._buffer)
+            if not match:
+                return found
+            self._in_array = True
+            self._pos = match.end()
+
+        buf = self._buffer
+        i = self._pos
+        while i < len(buf) and not self.done:
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c == '{':
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif c == '}' and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        found.append(json.loads(buf[self._start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._start = None
+            elif c == ']' and self._depth == 0:
+                self.done = True
+            i += 1
+
+        # Only the object still in progress needs to stay buffered
+        keep = self._start if self._start is not None else i
+        self._buffer = buf[keep:]
+        self._pos = i - keep
+        if self._start is not None:
+            self._start = 0
+        return found
+
+class QuestionStream:
+    """Validated questions from one generation call, playable while it is still running.
+
+    The producer ``add()``s questions as they are parsed and calls ``finish()``
+    at the end; the quiz loop ``pop()``s them (or iterates with ``async for``),
+    waiting only when it has caught up with the model.
+    """
+
+    def __init__(self):
+        self.questions: list[dict] = []
+        self.complete = False
+        self.error: Optional[Exception] = None
+        self._read = 0
+        self._changed = asyncio.Event()
+
+    @classmethod
+    def from_list(cls, questions: list) -> "QuestionStream":
+        stream = cls()
+        stream.questions = list(questions)
+        stream.complete = True
+        return stream
+
+    def __len__(self):
+        return len(self.questions)
+
+    def add(self, question: dict):
+        self.questions.append(question)
+        self._notify()
+
+    def finish(self, error: Exception = None):
+        if self.complete:
+            return
+        self.error = error
+        self.complete = True
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for(self, count: int):
+        while len(self.questions) < count and not self.complete:
+            await self._changed.wait()
+
+    async def wait_complete(self) -> list:
+        while not self.complete:
+            await self._changed.wait()
+        return self.questions
+
+    async def pop(self) -> Optional[dict]:
+        """Next unplayed question, or None once the stream is exhausted"""
+        await self.wait_for(self._read + 1)
+        if self._read >= len(self.questions):
+            return None
+        self._read += 1
+        return self.questions[self._read - 1]
+
+    async def follow(self):
+        """Iterate every question from the start with a private cursor (for sharing one stream)"""
+        index = 0
+        while True:
+            await self.wait_for(index + 1)
+            if index >= len(self.questions):
+                return
+            index += 1
+            yield self.questions[index - 1]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        question = await self.pop()
+        if question is None:
+            raise StopAsyncIteration
+        return question
+
+def parse_questions(text: str) -> list:
+    """Whole-body fallback: the questions list of the first ``{...}`` in a response"""
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not match:
+        return []
+    questions = json.loads(match.group()).get('questions', [])
+    return questions if isinstance(questions, list) else []
+
+def offer(stream: QuestionStream, accept: Callable[[dict], Optional[dict]], raw) -> bool:
+    """Add ``raw`` to ``stream`` if ``accept`` keeps it; malformed questions are skipped"""
+    try:
+        question = accept(raw) if isinstance(raw, dict) else None
+    except (KeyError, TypeError, AttributeError):
+        question = None
+    if question:
+        stream.add(question)
+    return bool(question)
+
+async def fill_questions(stream: QuestionStream, pieces: AsyncIterable[str], accept: Callable[[dict], Optional[dict]]):
+    """Parse a streamed response into ``stream``, keeping what ``accept`` returns for each raw question"""
+    parser = QuestionParser()
+    text = []
+    try:
+        async for piece in pieces:
+            text.append(piece)
+            for raw in parser.feed(piece):
+                offer(stream, accept, raw)
+        if not parser.done and not stream.questions:
+            # Not the expected shape; fall back to parsing the whole body at once
+            for raw in parse_questions("".join(text)):
+                offer(stream, accept, raw)
+        stream.finish()
+    except Exception as e:
+        print(f"Error streaming questions: {e}")
+        stream.finish(e)
+    finally:
+        stream.finish()
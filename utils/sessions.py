@@ -0,0 +1,219 @@
+import asyncio
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+def estimate_size(value, _seen: set = None) -> int:
+    """Approximate bytes held by a value, following containers and plain objects"""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _seen) for item in value)
+    return size
+
+class SessionNamespace:
+    """Dict-like view of one cog's entries in a SessionStore.
+
+    Reads refresh an entry's LRU position and idle timer. Values mutated in
+    place should be ``touch()``-ed afterwards so their size is re-measured.
+    """
+
+    def __init__(self, store: "SessionStore", name: str):
+        self.store = store
+        self.name = name
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self.store.get(self.name, key, default)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.store.get(self.name, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.store.set(self.name, key, value)
+
+    def __delitem__(self, key: Hashable):
+        if self.store.pop(self.name, key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.store.get(self.name, key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return self.store.count(self.name)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self.store.pop(self.name, key, default)
+
+    def setdefault(self, key: Hashable, default: Any) -> Any:
+        value = self.store.get(self.name, key, _MISSING)
+        if value is _MISSING:
+            self.store.set(self.name, key, default)
+            return default
+        return value
+
+    def touch(self, key: Hashable):
+        self.store.touch(self.name, key)
+
+    def pin(self, key: Hashable):
+        self.store.pin(self.name, key)
+
+    def unpin(self, key: Hashable):
+        self.store.unpin(self.name, key)
+
+class SessionStore:
+    """Bot-wide, memory-bounded home for per-user quiz state.
+
+    Entries from every namespace share one LRU and one byte budget: when the
+    estimated total exceeds ``max_bytes`` the least recently used entries are
+    dropped, and entries idle for longer than ``ttl`` seconds are swept
+    periodically. Anything evicted must be cheap to rebuild (e.g. content is
+    written through to the persistent store). State a running quiz depends
+    on is ``pin()``-ned for the length of the game: it still counts towards
+    the budget but is never evicted or expired.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 3600.0, sweep_interval: float = 60.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._entries: OrderedDict[tuple, list] = OrderedDict()  # (namespace, key) -> [value, size, last_access]
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._pins: dict[tuple, int] = {}
+        self._sweep_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_bytes=int(os.getenv('SESSION_MAX_BYTES', 64 * 1024 * 1024)),
+            ttl=float(os.getenv('SESSION_IDLE_TTL', 3600))
+        )
+
+    def namespace(self, name: str) -> SessionNamespace:
+        return SessionNamespace(self, name)
+
+    def start(self):
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    def close(self):
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return default
+        if time.monotonic() - entry[2] > self.ttl and (namespace, key) not in self._pins:
+            self._drop((namespace, key))
+            self.expirations += 1
+            return default
+        entry[2] = time.monotonic()
+        self._entries.move_to_end((namespace, key))
+        return entry[0]
+
+    def set(self, namespace: str, key: Hashable, value: Any):
+        self._drop((namespace, key))
+        size = estimate_size(value)
+        self._entries[(namespace, key)] = [value, size, time.monotonic()]
+        self.bytes += size
+        self._enforce_budget()
+
+    def touch(self, namespace: str, key: Hashable):
+        """Refresh an entry and re-measure it after an in-place change"""
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return
+        size = estimate_size(entry[0])
+        self.bytes += size - entry[1]
+        entry[1] = size
+        entry[2] = time.monotonic()
+        self._entries.move_to_end((namespace, key))
+        self._enforce_budget()
+
+    def pin(self, namespace: str, key: Hashable):
+        """Exempt an entry from eviction and expiry until a matching ``unpin()``"""
+        self._pins[(namespace, key)] = self._pins.get((namespace, key), 0) + 1
+
+    def unpin(self, namespace: str, key: Hashable):
+        count = self._pins.get((namespace, key), 0) - 1
+        if count > 0:
+            self._pins[(namespace, key)] = count
+        else:
+            self._pins.pop((namespace, key), None)
+        self._enforce_budget()
+
+    def pop(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        entry = self._drop((namespace, key))
+        return default if entry is None else entry[0]
+
+    def count(self, namespace: str) -> int:
+        return sum(1 for name, _ in self._entries if name == namespace)
+
+    def _drop(self, full_key: tuple):
+        entry = self._entries.pop(full_key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+        return entry
+
+    def _enforce_budget(self):
+        if self.bytes <= self.max_bytes:
+            return
+        for full_key in list(self._entries):
+            if self.bytes <= self.max_bytes:
+                break
+            if full_key not in self._pins:
+                self._drop(full_key)
+                self.evictions += 1
+
+    def sweep(self):
+        """Drop every entry that has been idle for longer than the TTL"""
+        cutoff = time.monotonic() - self.ttl
+        # Entries are in access order, so the idle ones are all at the front
+        for full_key, entry in list(self._entries.items()):
+            if entry[2] > cutoff:
+                break
+            if full_key not in self._pins:
+                self._drop(full_key)
+                self.expirations += 1
+
+    async def _sweep_loop(self):
+        try:
+            while True:
+                await asyncio.sleep(self.sweep_interval)
+                self.sweep()
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> dict:
+        namespaces = {}
+        for (name, _), entry in self._entries.items():
+            counters = namespaces.setdefault(name, {"entries": 0, "bytes": 0})
+            counters["entries"] += 1
+            counters["bytes"] += entry[1]
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "pinned": len(self._pins),
+            "namespaces": namespaces
+        }
@@ -0,0 +1,159 @@
+import hashlib
+import random
+import re
+from collections import OrderedDict, deque
+
+_PRIME = (1 << 61) - 1
+_STOPWORDS = {
+    'a', 'an', 'the', 'of', 'in', 'on', 'to', 'for', 'and', 'or', 'is', 'are', 'was', 'were',
+    'what', 'which', 'who', 'how', 'why', 'when', 'does', 'do', 'by', 'with', 'as', 'that', 'this'
+}
+
+def _stem(word: str) -> str:
+    for suffix in ('ing', 'ed', 'es', 's'):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+def shingles(text: str) -> set:
+    """Crudely stemmed content words of a question, so rewordings still overlap"""
+    return {_stem(w) for w in re.findall(r'[a-z0-9]+', str(text).lower()) if w not in _STOPWORDS}
+
+class MinHashLSH:
+    """Near-duplicate index over short texts using MinHash signatures and LSH banding.
+
+    A text is a near-duplicate when its estimated Jaccard similarity to an
+    indexed text reaches ``threshold``. Banding means only texts sharing at
+    least one band bucket are compared, so a lookup touches a handful of
+    candidates instead of every stored question. Two texts share a bucket
+    with high probability once their similarity passes roughly
+    ``(1 / bands) ** (1 / rows)``; the defaults (16 bands of 4 rows) put that
+    at 0.5, just under the default threshold, so recall stays high without
+    every loosely related question becoming a candidate. At most
+    ``max_items`` are kept; the oldest are forgotten first.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.6, max_items: int = 2000, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_items = max_items
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._signatures: dict[int, tuple] = {}
+        self._order = deque()
+        self._buckets: dict[tuple, set] = {}
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def signature(self, text: str) -> tuple:
+        hashed = [
+            int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+            for s in shingles(text)
+        ] or [0]
+        return tuple(min((a * h + b) % _PRIME for h in hashed) for a, b in self._perms)
+
+    def _band_keys(self, signature: tuple):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def similarity(self, first: tuple, second: tuple) -> float:
+        return sum(x == y for x, y in zip(first, second)) / self.num_perm
+
+    def candidates(self, signature: tuple) -> set:
+        """Ids of indexed texts sharing at least one band bucket with ``signature``"""
+        found = set()
+        for key in self._band_keys(signature):
+            found |= self._buckets.get(key, set())
+        return found
+
+    def find(self, text: str, signature: tuple = None) -> float:
+        """Highest estimated similarity to any indexed text (0.0 if no candidate)"""
+        signature = signature or self.signature(text)
+        candidates = self.candidates(signature)
+        return max((self.similarity(signature, self._signatures[c]) for c in candidates), default=0.0)
+
+    def add(self, text: str, signature: tuple = None):
+        signature = signature or self.signature(text)
+        item_id = self._next_id
+        self._next_id += 1
+        self._signatures[item_id] = signature
+        self._order.append(item_id)
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(item_id)
+        while len(self._order) > self.max_items:
+            self._remove(self._order.popleft())
+
+    def _remove(self, item_id: int):
+        signature = self._signatures.pop(item_id)
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def add_if_new(self, text: str) -> bool:
+        """Index ``text`` unless it is a near-duplicate; returns True if it was added"""
+        signature = self.signature(text)
+        if self.find(text, signature) >= self.threshold:
+            return False
+        self.add(text, signature)
+        return True
+
+class NearDuplicateFilter:
+    """Per-scope MinHash indexes with a rolling duplicate rate.
+
+    ``filter()`` keeps only questions that are not near-duplicates of
+    anything accepted earlier in the same scope (or earlier in the batch),
+    and records how many were rejected so callers can tell when a topic has
+    run dry. Only the ``max_scopes`` most recently used scopes are kept.
+    """
+
+    def __init__(self, threshold: float = 0.6, max_scopes: int = 256, max_items: int = 2000, window: int = 60):
+        self.threshold = threshold
+        self.max_scopes = max_scopes
+        self.max_items = max_items
+        self.window = window
+        self._scopes: OrderedDict[str, tuple[MinHashLSH, deque]] = OrderedDict()
+
+    def _scope(self, scope: str):
+        entry = self._scopes.get(scope)
+        if entry is None:
+            entry = (MinHashLSH(threshold=self.threshold, max_items=self.max_items), deque(maxlen=self.window))
+            self._scopes[scope] = entry
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+        else:
+            self._scopes.move_to_end(scope)
+        return entry
+
+    def filter(self, scope: str, questions: list, key=lambda q: q['question']) -> list:
+        index, recent = self._scope(scope)
+        accepted = []
+        for question in questions:
+            is_new = index.add_if_new(key(question))
+            recent.append(not is_new)
+            if is_new:
+                accepted.append(question)
+        return accepted
+
+    def __contains__(self, scope: str) -> bool:
+        return scope in self._scopes
+
+    def seed(self, scope: str, texts):
+        """Index already-accepted questions without counting them towards the duplicate rate"""
+        index, _ = self._scope(scope)
+        for text in texts:
+            index.add_if_new(text)
+
+    def duplicate_rate(self, scope: str) -> float:
+        entry = self._scopes.get(scope)
+        if not entry or not entry[1]:
+            return 0.0
+        recent = entry[1]
+        return sum(recent) / len(recent)
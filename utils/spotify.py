@@ -0,0 +1,82 @@
+import asyncio
+import time
+import aiohttp
+from typing import Optional
+
+class SpotifyError(Exception):
+    pass
+
+class SpotifyClient:
+    """Non-blocking Spotify Web API client using the client-credentials flow.
+
+    Requests go through the bot's shared HTTPClient. The access token is cached
+    and refreshed shortly before it expires, or immediately after a 401.
+    """
+
+    TOKEN_URL = "https://accounts.spotify.com/api/token"
+    API_URL = "https://api.spotify.com/v1"
+
+    def __init__(self, http_client, client_id: str, client_secret: str, market: str = "US"):
+        self.http_client = http_client
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.market = market
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def _get_token(self, force_refresh: bool = False) -> str:
+        if not force_refresh and self._token and time.monotonic() < self._token_expires_at:
+            return self._token
+
+        async with self._token_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not force_refresh and self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+
+            if not self.client_id or not self.client_secret:
+                raise SpotifyError("Spotify credentials are not configured")
+
+            async with self.http_client.post(
+                self.TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=aiohttp.BasicAuth(self.client_id, self.client_secret)
+            ) as resp:
+                if resp.status != 200:
+                    raise SpotifyError(f"Failed to obtain Spotify token (status {resp.status})")
+                payload = await resp.json()
+
+            self._token = payload["access_token"]
+            # Refresh a minute early so in-flight requests never carry an expired token
+            self._token_expires_at = time.monotonic() + payload.get("expires_in", 3600) - 60
+            return self._token
+
+    async def _get(self, path: str, params: dict = None) -> dict:
+        for attempt in range(2):
+            token = await self._get_token(force_refresh=attempt > 0)
+            status, data = await self.http_client.fetch_json(
+                "GET",
+                f"{self.API_URL}{path}",
+                params=params,
+                headers={"Authorization": f"Bearer {token}"},
+                cache="spotify"
+            )
+            if status == 401:
+                continue
+            if status != 200:
+                raise SpotifyError(f"Spotify API returned status {status}")
+            return data
+        raise SpotifyError("Spotify rejected the access token")
+
+    async def search_artist(self, name: str) -> Optional[dict]:
+        data = await self._get("/search", {"q": name, "type": "artist", "limit": 1})
+        items = data.get("artists", {}).get("items", [])
+        return items[0] if items else None
+
+    async def artist_top_tracks(self, artist_id: str) -> list:
+        data = await self._get(f"/artists/{artist_id}/top-tracks", {"market": self.market})
+        return data.get("tracks", [])
+
+    async def artist_related_artists(self, artist_id: str) -> list:
+        data = await self._get(f"/artists/{artist_id}/related-artists")
+        return data.get("artists", [])
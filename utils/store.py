@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+class PersistentStore:
+    """Embedded SQLite key/value store shared by the cogs.
+
+    Values are stored as JSON under a ``(namespace, key)`` pair with an
+    optional expiry. All database work runs on one dedicated thread so the
+    event loop never blocks on disk I/O and the connection is never shared
+    across threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store")
+
+    async def open(self):
+        await self._submit(self._open)
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS kv (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )"""
+        )
+        self._conn.commit()
+
+    async def close(self):
+        if self._conn is not None:
+            await self._submit(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    async def _submit(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any], *args) -> Any:
+        """Run ``fn(connection, *args)`` on the store thread.
+
+        Lets callers keep their own tables next to the key/value data.
+        """
+        def call():
+            result = fn(self._conn, *args)
+            self._conn.commit()
+            return result
+        return await self._submit(call)
+
+    async def get(self, namespace: str, key, default=None, with_timestamp: bool = False):
+        def query():
+            return self._conn.execute(
+                "SELECT value, updated_at, expires_at FROM kv WHERE namespace = ? AND key = ?",
+                (namespace, str(key))
+            ).fetchone()
+
+        row = await self._submit(query)
+        if row is None or (row[2] is not None and row[2] < time.time()):
+            return (default, None) if with_timestamp else default
+        value = json.loads(row[0])
+        return (value, row[1]) if with_timestamp else value
+
+    async def set(self, namespace: str, key, value, ttl: float = None):
+        now = time.time()
+        payload = json.dumps(value)
+
+        def write():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, updated_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, str(key), payload, now, now + ttl if ttl is not None else None)
+            )
+            self._conn.commit()
+
+        await self._submit(write)
+
+    async def delete(self, namespace: str, key):
+        def write():
+            self._conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, str(key)))
+            self._conn.commit()
+
+        await self._submit(write)
+
+    async def items(self, namespace: str) -> list[tuple[str, Any]]:
+        def query():
+            return self._conn.execute(
+                "SELECT key, value FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at >= ?)",
+                (namespace, time.time())
+            ).fetchall()
+
+        return [(key, json.loads(value)) for key, value in await self._submit(query)]
+
+    async def purge_expired(self) -> int:
+        def write():
+            cursor = self._conn.execute(
+                "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+        return await self._submit(write)